@@ -6,16 +6,15 @@ from flask import jsonify, request, abort
 from models import storage
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, page_of
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@conditional_list(Amenity)
 def get_amenities():
     """Retrieve the list of all Amenity objects"""
-    amenities_list = []
-    amenities = storage.all(Amenity).values()
-    for amenity in amenities:
-        amenities_list.append(amenity.to_dict())
-    return jsonify(amenities_list)
+    return list_response(page_of(Amenity))
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
@@ -25,7 +24,7 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return object_response(amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
@@ -67,5 +66,5 @@ def update_amenity(amenity_id):
     for key, value in data.items():
         if key not in ['id', 'created_at', 'updated_at']:
             setattr(amenity, key, value)
-    storage.save()
+    amenity.save()
     return jsonify(amenity.to_dict())
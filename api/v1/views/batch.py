@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Defines the RESTful API endpoints creating objects in batches.
+
+`POST /api/v1/<resource>/batch` takes a JSON list of objects, validates
+each of them like the endpoint creating a single object would, and
+stores the valid ones BATCH_CHUNK at a time with one save per chunk.
+The response lists, for each item in order, either the created object
+with status 201 or the error that rejected it, such as a timestamp that
+does not parse. It is sent with status
+201 when every item was created, and 207 otherwise.
+"""
+from flask import jsonify, request, abort
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from api.v1.views import app_views
+
+# number of objects stored per save
+BATCH_CHUNK = 1000
+
+# class, required attributes in the order they are checked, and the class
+# of the object each foreign key attribute must reference, by resource
+batch_resources = {
+    "states": (State, ["name"], {}),
+    "amenities": (Amenity, ["name"], {}),
+    "users": (User, ["email", "password"], {}),
+    "cities": (City, ["state_id", "name"], {"state_id": State}),
+    "places": (Place, ["city_id", "user_id", "name"],
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ["place_id", "user_id", "text"],
+                {"place_id": Place, "user_id": User})
+}
+
+
+def batch_error(data, required, parents, found):
+    """Returns the (status, error) rejecting data, or None if it is valid
+
+    found caches the result of the parent lookups of the current chunk.
+    """
+    if not isinstance(data, dict):
+        return 400, "Not a JSON object"
+    for attr in required:
+        if attr not in data:
+            return 400, "Missing {}".format(attr)
+        if attr in parents:
+            key = (attr, data[attr])
+            if key not in found:
+                found[key] = storage.get(parents[attr],
+                                         data[attr]) is not None
+            if not found[key]:
+                return 404, "Not found"
+    return None
+
+
+@app_views.route('/<resource>/batch', methods=['POST'], strict_slashes=False)
+def create_batch(resource):
+    """Create a list of objects of a resource"""
+    if resource not in batch_resources:
+        abort(404)
+    cls, required, parents = batch_resources[resource]
+    if not request.is_json:
+        abort(400, description="Not a JSON")
+    items = request.get_json()
+    if not isinstance(items, list):
+        abort(400, description="Not a JSON list")
+    results = []
+    for start in range(0, len(items), BATCH_CHUNK):
+        found = {}
+        created = []
+        for index, data in enumerate(items[start:start + BATCH_CHUNK],
+                                     start):
+            error = batch_error(data, required, parents, found)
+            if error is not None:
+                results.append({"index": index, "status": error[0],
+                                "error": error[1]})
+                continue
+            try:
+                obj = cls(**data)
+            except (TypeError, ValueError) as e:
+                results.append({"index": index, "status": 400,
+                                "error": str(e)})
+                continue
+            created.append(obj)
+            results.append({"index": index, "status": 201, "object": obj})
+        storage.bulk_new(created)
+        storage.save()
+    for result in results:
+        if "object" in result:
+            result["object"] = result["object"].to_dict()
+    if all(result["status"] == 201 for result in results):
+        return jsonify(results), 201
+    return jsonify(results), 207
@@ -7,20 +7,19 @@ from models import storage
 from models.state import State
 from models.city import City
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, paginate
 
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@conditional_list(City, State)
 def get_cities(state_id):
     """Retrieve the list of all City objects of a State"""
-    cities_list = []
-    state = storage.get(State, state_id)
+    state = storage.get(State, state_id, load=["cities"])
     if state is None:
         abort(404)
-    cities = state.cities
-    for city in cities:
-        cities_list.append(city.to_dict())
-    return jsonify(cities_list)
+    return list_response(paginate(state.cities))
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
@@ -29,7 +28,7 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
-    return jsonify(city.to_dict())
+    return object_response(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
@@ -74,5 +73,5 @@ def update_city(city_id):
     for key, value in data.items():
         if key not in ['id', 'state_id', 'created_at', 'updated_at']:
             setattr(city, key, value)
-    storage.save()
+    city.save()
     return jsonify(city.to_dict())
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Helpers answering conditional GET requests.
+
+Every object is sent with a strong `ETag` derived from its id and
+updated_at, and with its updated_at as `Last-Modified`. Every list is
+sent with an `ETag` derived from the URL and from the storage generation
+of the classes it is built from, which changes whenever one of their
+objects is added, deleted or saved. A request whose `If-None-Match` or
+`If-Modified-Since` header matches is answered with 304 Not Modified
+before anything is serialized or, for lists, read from storage. Storage
+engines without generations get lists compared by their content.
+"""
+import hashlib
+from functools import wraps
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+from models import storage
+from models.base_model import time
+
+
+def object_etag(obj):
+    """Returns the ETag of the current representation of obj"""
+    return "{}-{}".format(obj.id, obj.updated_at.strftime(time))
+
+
+def not_modified(etag, last_modified=None):
+    """Returns the 304 response answering the request when its
+    validators match etag or last_modified, or None otherwise"""
+    if is_resource_modified(request.environ, etag=etag,
+                            last_modified=last_modified):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def object_response(obj):
+    """Returns the JSON response holding obj, or 304 when the client
+    already has its current representation"""
+    etag = object_etag(obj)
+    response = not_modified(etag, obj.updated_at)
+    if response is not None:
+        return response
+    response = Response(obj.to_json_bytes(), mimetype='application/json')
+    response.set_etag(etag)
+    response.last_modified = obj.updated_at
+    return response
+
+
+def conditional_list(*clss):
+    """Decorates a view listing objects of the classes clss, so that it is
+    only run when the client does not have the current list
+
+    When storage has no generation for one of clss, the view is run and
+    the ETag is derived from the response body, so that only sending the
+    list is saved."""
+    def decorator(view):
+        """Returns view answering conditional requests"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """Runs view unless the client has the current list"""
+            key = [request.full_path]
+            key.extend(storage.generation(cls) for cls in clss)
+            if None in key:
+                response = view(*args, **kwargs)
+                if response.status_code == 200 and not response.is_streamed:
+                    response.add_etag()
+                    response.make_conditional(request)
+                return response
+            etag = hashlib.sha1("\n".join(key).encode()).hexdigest()
+            response = not_modified(etag)
+            if response is not None:
+                return response
+            response = view(*args, **kwargs)
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
@@ -6,12 +6,20 @@ This module defines the index routes for the API, including:
 - `/status`: Returns the status of the API with a JSON response
   indicating "OK".
 - `/stats`: Retrieves and returns the number of objects of each type
-  (Amenity, City, Place, Review, State, User) in the database.
+  (Amenity, City, Place, Review, State, User) in the database, counted
+  in a single call to the storage engine.
+- `/stats/pool`: Retrieves the connection pool metrics of the database
+  storage; not found with the file storage.
+- `/stats/cache`: Retrieves the object cache metrics of the database
+  storage; not found when the cache is disabled or with the file storage.
 """
-from flask import jsonify
+from flask import abort, jsonify
 from api.v1.views import app_views
 from models import storage
 
+stats_names = {"Amenity": "amenities", "City": "cities", "Place": "places",
+               "Review": "reviews", "State": "states", "User": "users"}
+
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
 def status():
@@ -22,12 +30,27 @@ def status():
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
 def get_stats():
     """Retrieves the number of each objects by type"""
-    stats = {
-        "amenities": storage.count("Amenity"),
-        "cities": storage.count("City"),
-        "places": storage.count("Place"),
-        "reviews": storage.count("Review"),
-        "states": storage.count("State"),
-        "users": storage.count("User")
-    }
+    counts = storage.counts(list(stats_names))
+    stats = {}
+    for name, counted in counts.items():
+        stats[stats_names[name]] = counted
+    return jsonify(stats)
+
+
+@app_views.route('/stats/pool', methods=['GET'], strict_slashes=False)
+def get_pool_stats():
+    """Retrieves the connection pool metrics of the storage"""
+    pool_stats = getattr(storage, 'pool_stats', None)
+    if pool_stats is None:
+        abort(404)
+    return jsonify(pool_stats())
+
+
+@app_views.route('/stats/cache', methods=['GET'], strict_slashes=False)
+def get_cache_stats():
+    """Retrieves the object cache metrics of the storage"""
+    cache_stats = getattr(storage, 'cache_stats', None)
+    stats = cache_stats() if cache_stats is not None else None
+    if stats is None:
+        abort(404)
     return jsonify(stats)
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Helpers shared by the views returning lists of objects.
+
+Every list endpoint accepts two optional query string parameters:
+- `limit`: maximum number of objects to return.
+- `cursor`: opaque position returned by a previous page; only the objects
+  after it, in (created_at, id) order, are returned.
+When a page is full, the response carries the cursor of the next page in
+an `X-Next-Cursor` header and in a `Link` header with rel="next".
+
+With `stream=true`, the list is sent as a chunked response written while
+the objects are read from storage, so memory use does not grow with the
+size of the collection.
+"""
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import Response, abort, request, stream_with_context
+from models import storage
+from models.base_model import time
+
+# number of objects serialized per chunk of a streamed response
+STREAM_BATCH = 100
+
+
+def encode_cursor(obj):
+    """Returns the cursor pointing just after obj"""
+    key = [obj.created_at.strftime(time), obj.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns the (created_at, id) position encoded in cursor"""
+    try:
+        created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.strptime(created_at, time), obj_id
+    except (TypeError, ValueError):
+        abort(400, description="Invalid cursor")
+
+
+def page_args():
+    """Returns the (limit, cursor) requested in the query string"""
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            abort(400, description="Invalid limit")
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        cursor = decode_cursor(cursor)
+    return limit, cursor
+
+
+def streaming():
+    """Returns True when the query string asks for a streamed response"""
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+
+def page_of(cls):
+    """Returns the requested page of the objects of cls in storage"""
+    limit, cursor = page_args()
+    if limit is None and cursor is None:
+        if streaming():
+            return storage.iter(cls, STREAM_BATCH)
+        return list(storage.all(cls).values())
+    return storage.page(cls, limit, cursor)
+
+
+def paginate(objs):
+    """Returns the requested page of the list objs"""
+    limit, cursor = page_args()
+    if limit is None and cursor is None:
+        return list(objs)
+    objs = sorted(objs, key=lambda obj: (obj.created_at, obj.id))
+    if cursor is not None:
+        objs = [obj for obj in objs if (obj.created_at, obj.id) > cursor]
+    return objs[:limit]
+
+
+def list_response(objs):
+    """Returns the JSON response listing objs, a page of a collection"""
+    if streaming():
+        response = stream_response(objs)
+    else:
+        response = Response(
+            b"[" + b",".join(obj.to_json_bytes() for obj in objs) + b"]",
+            mimetype='application/json')
+    limit = page_args()[0]
+    if limit is not None and len(objs) == limit:
+        cursor = encode_cursor(objs[-1])
+        args = request.args.to_dict()
+        args['cursor'] = cursor
+        response.headers['X-Next-Cursor'] = cursor
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
+
+
+def stream_response(objs):
+    """Returns a chunked JSON response listing the iterable objs"""
+    def generate():
+        """Yields the JSON array of objs, STREAM_BATCH objects at a time"""
+        separator = b"["
+        batch = []
+        for obj in objs:
+            batch.append(obj.to_json_bytes())
+            if len(batch) == STREAM_BATCH:
+                yield separator + b", ".join(batch)
+                separator = b", "
+                batch = []
+        if batch:
+            yield separator + b", ".join(batch)
+            separator = b", "
+        yield b"]" if separator == b", " else b"[]"
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
@@ -11,20 +11,19 @@ from models.place import Place
 from models.state import State
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, page_of, paginate
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@conditional_list(Place, City)
 def get_places(city_id):
     """Retrieve the list of all Place objects of a City"""
-    places_list = []
-    city = storage.get(City, city_id)
+    city = storage.get(City, city_id, load=["places"])
     if city is None:
         abort(404)
-    places = city.places
-    for place in places:
-        places_list.append(place.to_dict())
-    return jsonify(places_list)
+    return list_response(paginate(city.places))
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -33,7 +32,7 @@ def get_place(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    return jsonify(place.to_dict())
+    return object_response(place)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -84,7 +83,7 @@ def update_place(place_id):
     for key, value in data.items():
         if key not in ['id', 'user_id', 'city_id', 'created_at', 'updated_at']:
             setattr(place, key, value)
-    storage.save()
+    place.save()
     return jsonify(place.to_dict())
 
 
@@ -100,32 +99,6 @@ def search_places():
     amenities = data.get('amenities', [])
 
     if not states and not cities and not amenities:
-        # Retrieve all Place objects
-        places = storage.all(Place).values()
-        return jsonify([place.to_dict() for place in places])
-
-    places = set()
-
-    # Retrieve Place objects based on states
-    if states:
-        for state_id in states:
-            state = storage.get(State, state_id)
-            if state:
-                for city in state.cities:
-                    places.update(city.places)
-
-    # Retrieve Place objects based on cities
-    if cities:
-        for city_id in cities:
-            city = storage.get(City, city_id)
-            if city:
-                places.update(city.places)
-
-    # Filter Place objects based on amenities
-    if amenities:
-        places = [
-            place for place in places
-            if all(amenity.id in place.amenity_ids
-                   for amenity in amenities)]
-
-    return jsonify([place.to_dict() for place in places])
+        return list_response(page_of(Place))
+    places = storage.search_places(states, cities, amenities)
+    return list_response(paginate(places))
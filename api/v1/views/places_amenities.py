@@ -8,6 +8,8 @@ from models import storage
 from models.place import Place
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list
+from api.v1.views.lists import list_response, paginate
 
 
 storage_type = os.getenv("HBNB_TYPE_STORAGE")
@@ -15,19 +17,13 @@ storage_type = os.getenv("HBNB_TYPE_STORAGE")
 
 @app_views.route('/places/<place_id>/amenities',
                  methods=['GET'], strict_slashes=False)
+@conditional_list(Amenity, Place)
 def get_place_amenities(place_id):
     """Retrieve the list of all Amenity objects of a Place"""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["amenities"])
     if place is None:
         abort(404)
-    if storage_type == 'db':
-        amenities = place.amenities
-    else:
-        amenities = [
-            storage.get(Amenity, amenity_id)
-            for amenity_id in place.amenity_ids
-            if storage.get(Amenity, amenity_id)]
-    return jsonify([amenity.to_dict() for amenity in amenities])
+    return list_response(paginate(place.amenities))
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -47,8 +43,10 @@ def delete_place_amenity(place_id, amenity_id):
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
-    storage.save()
+        place.amenity_ids = [place_amenity_id for place_amenity_id
+                             in place.amenity_ids
+                             if place_amenity_id != amenity_id]
+    place.save()
     return {}, 200
 
 
@@ -69,6 +67,6 @@ def link_place_amenity(place_id, amenity_id):
     else:
         if amenity_id in place.amenity_ids:
             return jsonify(storage.get(Amenity, amenity_id).to_dict()), 200
-        place.amenity_ids.append(amenity_id)
-    storage.save()
+        place.amenity_ids = place.amenity_ids + [amenity_id]
+    place.save()
     return jsonify(amenity.to_dict()), 201
@@ -8,20 +8,19 @@ from models.place import Place
 from models.user import User
 from models.review import Review
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, paginate
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@conditional_list(Review, Place)
 def get_reviews(place_id):
     """Retrieve the list of all Review objects of a Place"""
-    review_list = []
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["reviews"])
     if place is None:
         abort(404)
-    reviews = place.reviews
-    for review in reviews:
-        review_list.append(review.to_dict())
-    return jsonify(review_list)
+    return list_response(paginate(place.reviews))
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -30,7 +29,7 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict())
+    return object_response(review)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -82,5 +81,5 @@ def update_review(review_id):
         if key not in ['id', 'user_id', 'place_id', 'created_at',
                        'updated_at']:
             setattr(review, key, value)
-    storage.save()
+    review.save()
     return jsonify(review.to_dict())
@@ -6,16 +6,15 @@ from flask import jsonify, request, abort
 from models import storage
 from models.state import State
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, page_of
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@conditional_list(State)
 def get_states():
     """Retrieve the list of all State objects"""
-    states_list = []
-    states = storage.all(State).values()
-    for state in states:
-        states_list.append(state.to_dict())
-    return jsonify(states_list)
+    return list_response(page_of(State))
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -24,7 +23,7 @@ def get_state(state_id):
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
-    return jsonify(state.to_dict())
+    return object_response(state)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -65,5 +64,5 @@ def update_state(state_id):
     for key, value in data.items():
         if key not in ['id', 'created_at', 'updated_at']:
             setattr(state, key, value)
-    storage.save()
+    state.save()
     return jsonify(state.to_dict())
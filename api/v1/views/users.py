@@ -6,16 +6,15 @@ from flask import jsonify, request, abort
 from models import storage
 from models.user import User
 from api.v1.views import app_views
+from api.v1.views.conditional import conditional_list, object_response
+from api.v1.views.lists import list_response, page_of
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@conditional_list(User)
 def get_users():
     """Retrieve the list of all User objects"""
-    users_list = []
-    users = storage.all(User).values()
-    for user in users:
-        users_list.append(user.to_dict())
-    return jsonify(users_list)
+    return list_response(page_of(User))
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -24,7 +23,7 @@ def get_user(user_id):
     user = storage.get(User, user_id)
     if user is None:
         abort(404)
-    return jsonify(user.to_dict())
+    return object_response(user)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'], strict_slashes=False)
@@ -66,5 +65,5 @@ def update_user(user_id):
     for key, value in data.items():
         if key not in ['id', 'email', 'created_at', 'updated_at']:
             setattr(user, key, value)
-    storage.save()
+    user.save()
     return jsonify(user.to_dict())
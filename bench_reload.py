@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Measures how fast the file storage reloads a large file.json.
+
+    ./bench_reload.py -n 1000000
+
+A file of n records spread over the model classes is written to a
+temporary directory, then:
+- the records are built into objects with cls(**record), the generic
+  constructor path, and with cls.from_storage(record), the path used by
+  FileStorage.reload();
+- FileStorage.reload() reads and rebuilds the whole file.
+Each step is reported in objects per second. The temporary directory is
+removed afterwards.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+# (class name, attributes) of the generated records
+shapes = [("State", {"name": "California"}),
+          ("City", {"name": "San Francisco", "state_id": ""}),
+          ("User", {"email": "a@b.c", "first_name": "Betty",
+                    "password": "0cc175b9c0f1b6a831c399e269772661"}),
+          ("Place", {"name": "Home", "city_id": "", "user_id": "",
+                     "number_rooms": 2, "latitude": 37.7}),
+          ("Review", {"text": "Great", "place_id": "", "user_id": ""}),
+          ("Amenity", {"name": "Wifi"})]
+
+
+def records_of(n):
+    """returns n records, as saved by the storage"""
+    records = {}
+    for i in range(n):
+        name, attrs = shapes[i % len(shapes)]
+        record = dict(attrs, id=str(uuid.uuid4()), __class__=name,
+                      created_at="2017-03-25T02:17:06.000000",
+                      updated_at="2017-03-25T02:17:06.000000")
+        records["{}.{}".format(name, record["id"])] = record
+    return records
+
+
+def report(step, n, seconds, out):
+    """prints the throughput of a step"""
+    print("{:<24} {:>8.2f}s {:>12,.0f} objects/s".format(
+        step, seconds, n / seconds), file=out)
+
+
+def main(argv=None):
+    """writes the file, then times the builders and reload()"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--objects", type=int, default=1000000,
+                        help="number of records (default: 1000000)")
+    args = parser.parse_args(argv)
+    out = sys.stdout
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    os.chdir(tmp)
+    try:
+        # models reloads file.json from the working directory on import
+        os.environ.pop("HBNB_TYPE_STORAGE", None)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import models
+        from models.engine.codec import get_codec
+        from models.engine.file_storage import classes
+        codec = get_codec("json")
+        records = records_of(args.objects)
+        with open("file.json", "wb") as f:
+            f.write(codec.dumps(records))
+        del records
+        start = time.perf_counter()
+        with open("file.json", "rb") as f:
+            records = codec.loads(f.read())
+        report("decode", args.objects, time.perf_counter() - start, out)
+        for step, build in [
+                ("cls(**record)", lambda cls, record: cls(**record)),
+                ("cls.from_storage()",
+                 lambda cls, record: cls.from_storage(record))]:
+            start = time.perf_counter()
+            objs = [build(classes[record["__class__"]], record)
+                    for record in records.values()]
+            report(step, args.objects, time.perf_counter() - start, out)
+            del objs
+        del records
+        start = time.perf_counter()
+        models.storage.reload()
+        report("FileStorage.reload()", args.objects,
+               time.perf_counter() - start, out)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
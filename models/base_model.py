@@ -7,19 +7,65 @@ from datetime import datetime
 import models
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, event
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 import hashlib
+import threading
+import weakref
+from models.engine.codec import get_codec
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# instances assigned an attribute since storage last serialized them
+dirty = weakref.WeakSet()
+# serializes the threads marking and taking dirty instances
+dirty_lock = threading.Lock()
+# {include_password: to_dict(), "json": to_json_bytes()} of the instances,
+# dropped when they are assigned
+serialized = weakref.WeakKeyDictionary()
+json_codec = get_codec("json")
 
 if models.storage_t == "db":
     Base = declarative_base()
+
+    def forget(target, *args):
+        """drops the serialized forms of an instance whose attributes the
+        session reloaded or expired"""
+        serialized.pop(target, None)
+
+    def forget_written(mapper, connection, target):
+        """drops the serialized forms of an instance whose foreign keys
+        and defaults the session may have set while flushing it"""
+        serialized.pop(target, None)
+
+    for name in ("expire", "refresh", "refresh_flush"):
+        event.listen(Base, name, forget, propagate=True)
+    for name in ("after_insert", "after_update"):
+        event.listen(Base, name, forget_written, propagate=True)
 else:
     Base = object
 
 
+def mark_dirty(obj):
+    """adds obj to the dirty instances"""
+    with dirty_lock:
+        dirty.add(obj)
+
+
+def peek_dirty():
+    """returns the dirty instances, leaving them dirty"""
+    with dirty_lock:
+        return list(dirty)
+
+
+def take_dirty():
+    """returns the dirty instances and marks them all clean"""
+    with dirty_lock:
+        objs = list(dirty)
+        dirty.clear()
+    return objs
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
@@ -48,6 +94,41 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    @classmethod
+    def from_storage(cls, record):
+        """returns the instance stored as record, a to_dict() of it
+
+        Unlike cls(**record), the attributes are assigned all at once, the
+        datetimes are parsed with fromisoformat, a stored password is kept
+        as the hash it already is and the instance is not marked dirty.
+        With the database storage, whose instances must be built through
+        their mapper, the constructor is used and the password restored.
+        """
+        attrs = dict(record)
+        attrs.pop("__class__", None)
+        if models.storage_t == "db":
+            password = attrs.pop("password", None)
+            obj = cls(**attrs)
+            if password is not None:
+                obj.password = password
+            return obj
+        for name in ("created_at", "updated_at"):
+            if type(attrs.get(name)) is str:
+                attrs[name] = datetime.fromisoformat(attrs[name])
+            else:
+                attrs[name] = datetime.utcnow()
+        if attrs.get("id") is None:
+            attrs["id"] = str(uuid.uuid4())
+        obj = cls.__new__(cls)
+        obj.__dict__.update(attrs)
+        return obj
+
+    def __setattr__(self, name, value):
+        """sets an attribute and marks the instance as dirty"""
+        super().__setattr__(name, value)
+        mark_dirty(self)
+        serialized.pop(self, None)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -59,8 +140,33 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
+    def __serialized(self):
+        """returns the serialized forms of the instance cached so far"""
+        forms = serialized.get(self)
+        if forms is None:
+            forms = serialized[self] = {}
+        return forms
+
     def to_dict(self, include_password=False):
-        """returns a dictionary containing all keys/values of the instance"""
+        """returns a dictionary containing all keys/values of the instance
+
+        The dictionary is built once and copied until the instance is
+        assigned an attribute."""
+        forms = self.__serialized()
+        if include_password not in forms:
+            forms[include_password] = self.__to_dict(include_password)
+        return dict(forms[include_password])
+
+    def to_json_bytes(self):
+        """returns to_dict() encoded as JSON, encoded once until the
+        instance is assigned an attribute"""
+        forms = self.__serialized()
+        if "json" not in forms:
+            forms["json"] = json_codec.dumps(self.to_dict())
+        return forms["json"]
+
+    def __to_dict(self, include_password):
+        """builds the dictionary returned by to_dict()"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
             new_dict["created_at"] = new_dict["created_at"].strftime(time)
@@ -69,6 +175,8 @@ class BaseModel:
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+            for key in self.__mapper__.relationships.keys():
+                new_dict.pop(key, None)
         if not include_password and 'password' in new_dict:
             del new_dict['password']
         return new_dict
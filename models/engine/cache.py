@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the ObjectCache class
+"""
+
+from collections import OrderedDict
+import sys
+import threading
+import time
+
+
+def sizeof(value):
+    """returns the approximate number of bytes held by value and by the
+    dictionaries, lists and tuples it contains"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sizeof(key) + sizeof(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += sizeof(item)
+    return size
+
+
+class ObjectCache:
+    """least recently used cache whose entries expire after a time to live
+
+    Entries are evicted, least recently used first, when there are more
+    than max_entries of them or when they hold more than max_bytes, as
+    measured by sizeof(). The cache is shared by the threads of the
+    process and counts its hits, misses, evictions, expirations and
+    invalidations.
+
+    Every invalidation advances a clock and stamps the invalidated key
+    with it, in a fixed table of slots shared by the keys of equal hash.
+    A value read from the source after taking version() is only cached
+    by put(key, value, version) if key was not invalidated since, so
+    that a value read before a concurrent change is not cached after it.
+    """
+
+    slots = 4096
+
+    def __init__(self, max_entries, ttl=60, max_bytes=64 << 20):
+        """Instantiate an ObjectCache"""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+        self.__clock = 0
+        self.__stamps = [0] * self.slots
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0,
+                        "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        """returns the value cached at key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self.__remove(key)
+                self.__stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.__stats["misses"] += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+            return entry[0]
+
+    def version(self):
+        """returns the invalidation clock, to be passed to put() for the
+        values read after this call"""
+        with self.__lock:
+            return self.__clock
+
+    def put(self, key, value, version=None):
+        """caches value at key, evicting the least recently used entries
+        beyond the limits, unless key was invalidated after version"""
+        size = sizeof(key) + sizeof(value)
+        with self.__lock:
+            if version is not None and self.__stamp(key) > version:
+                return
+            self.__remove(key)
+            self.__entries[key] = (value, time.monotonic() + self.ttl, size)
+            self.__bytes += size
+            while self.__entries and (
+                    len(self.__entries) > self.max_entries or
+                    self.__bytes > self.max_bytes):
+                self.__remove(next(iter(self.__entries)))
+                self.__stats["evictions"] += 1
+
+    def invalidate(self, *keys):
+        """removes the entries cached at keys"""
+        with self.__lock:
+            self.__clock += 1
+            for key in keys:
+                self.__stamps[hash(key) % self.slots] = self.__clock
+                if self.__remove(key):
+                    self.__stats["invalidations"] += 1
+
+    def clear(self):
+        """removes every entry"""
+        with self.__lock:
+            self.__clock += 1
+            self.__stamps = [self.__clock] * self.slots
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __stamp(self, key):
+        """returns the clock of the last invalidation of key, while the
+        lock is held"""
+        return self.__stamps[hash(key) % self.slots]
+
+    def __remove(self, key):
+        """removes the entry at key, while the lock is held, and returns
+        whether there was one"""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return False
+        self.__bytes -= entry[2]
+        return True
+
+    def stats(self):
+        """returns the counters of the cache, its number of entries and
+        bytes, and the ratio of hits to lookups"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["entries"] = len(self.__entries)
+            stats["bytes"] = self.__bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage reads and writes its files with
+
+Each codec turns the {<class name>.id: to_dict()} records of the storage
+into bytes and back:
+- "json": JSON text, through orjson when it is installed and the standard
+  json module otherwise; both read each other's files.
+- "msgpack": MessagePack, with created_at and updated_at stored as integer
+  microseconds since the epoch; needs the msgpack package.
+
+Run as a script to convert a file from one codec to the other, the codecs
+being chosen from the file extensions:
+
+    python3 -m models.engine.codec file.json file.msgpack
+"""
+
+from datetime import datetime, timedelta
+import json
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# attributes of the records holding datetimes
+time_keys = ("created_at", "updated_at")
+epoch = datetime(1970, 1, 1)
+
+
+class JSONCodec:
+    """stores records as JSON text"""
+    name = "json"
+    extension = ".json"
+
+    def dumps(self, records):
+        """returns records as JSON bytes"""
+        if orjson is not None:
+            return orjson.dumps(records)
+        return json.dumps(records).encode()
+
+    def loads(self, data):
+        """returns the records held by the JSON bytes data"""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """stores records as MessagePack, with datetimes as epoch microseconds"""
+    name = "msgpack"
+    extension = ".msgpack"
+
+    def __init__(self):
+        """Instantiate a MsgpackCodec, which needs the msgpack package"""
+        if msgpack is None:
+            raise ImportError("the msgpack codec needs the msgpack package")
+
+    def dumps(self, records):
+        """returns records as MessagePack bytes"""
+        return msgpack.packb(encode_times(records), use_bin_type=True)
+
+    def loads(self, data):
+        """returns the records held by the MessagePack bytes data"""
+        return decode_times(msgpack.unpackb(data, raw=False))
+
+
+codecs = {"json": JSONCodec, "msgpack": MsgpackCodec}
+
+
+def get_codec(name):
+    """returns the codec called name"""
+    if name not in codecs:
+        raise ValueError("unknown codec: {}".format(name))
+    return codecs[name]()
+
+
+def codec_of(path):
+    """returns the codec of the file at path, from its extension"""
+    extension = os.path.splitext(path)[1]
+    for codec in codecs.values():
+        if codec.extension == extension:
+            return codec()
+    raise ValueError("no codec for the extension of {}".format(path))
+
+
+def encode_times(records):
+    """returns a copy of records with their datetimes as integer
+    microseconds since the epoch"""
+    encoded = {}
+    for key, record in records.items():
+        record = dict(record)
+        for name in time_keys:
+            if isinstance(record.get(name), str):
+                delta = datetime.fromisoformat(record[name]) - epoch
+                record[name] = ((delta.days * 86400 + delta.seconds) *
+                                1000000 + delta.microseconds)
+        encoded[key] = record
+    return encoded
+
+
+def decode_times(records):
+    """turns the epoch microseconds of records back into the datetime
+    strings of to_dict(), in place, and returns records"""
+    for record in records.values():
+        for name in time_keys:
+            if isinstance(record.get(name), int):
+                record[name] = (epoch + timedelta(
+                    microseconds=record[name])).isoformat(
+                        timespec="microseconds")
+    return records
+
+
+def convert(source, destination):
+    """rewrites the file at source to destination, with the codecs of
+    their extensions"""
+    with open(source, 'rb') as f:
+        records = codec_of(source).loads(f.read())
+    with open(destination, 'wb') as f:
+        f.write(codec_of(destination).dumps(records))
+    return len(records)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python3 -m models.engine.codec SOURCE DESTINATION",
+              file=sys.stderr)
+        sys.exit(1)
+    print("converted {} objects".format(convert(sys.argv[1], sys.argv[2])))
@@ -3,21 +3,98 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.cache import ObjectCache
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, distinct, event, func, or_, select
+from sqlalchemy.orm import (make_transient_to_detached, scoped_session,
+                            selectinload, sessionmaker)
+from sqlalchemy.orm.attributes import (PASSIVE_NO_INITIALIZE, get_history,
+                                       set_committed_value)
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.pool import QueuePool, StaticPool
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes bulk_update() leaves untouched
+bulk_ignored = ("id", "created_at", "updated_at", "__class__")
+
+
+def pool_options(url):
+    """Returns the create_engine() pool arguments for the database at url
+
+    They are read from the HBNB_MYSQL_POOL_SIZE, HBNB_MYSQL_POOL_OVERFLOW,
+    HBNB_MYSQL_POOL_TIMEOUT, HBNB_MYSQL_POOL_RECYCLE and
+    HBNB_MYSQL_POOL_PRE_PING environment variables. An in-memory SQLite
+    database only lives as long as its connection, so all the threads
+    share a single one.
+    """
+    if url.startswith("sqlite") and url.split("/")[-1] in ("", ":memory:"):
+        return {"poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False}}
+    options = {
+        "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', '5')),
+        "max_overflow": int(getenv('HBNB_MYSQL_POOL_OVERFLOW', '10')),
+        "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT', '30')),
+        "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', '3600')),
+        "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING', '1') == '1'
+    }
+    if url.startswith("sqlite"):
+        options["poolclass"] = QueuePool
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def sqlite_pragmas(url):
+    """Returns the PRAGMA statements run on each SQLite connection
+
+    File databases use write-ahead logging, so readers do not block the
+    writer. HBNB_SQLITE_SYNCHRONOUS, HBNB_SQLITE_MMAP_SIZE (bytes),
+    HBNB_SQLITE_CACHE_SIZE (pages, or KiB when negative) and
+    HBNB_SQLITE_BUSY_TIMEOUT (ms) tune the others.
+    """
+    pragmas = ["PRAGMA foreign_keys=ON",
+               "PRAGMA busy_timeout={:d}".format(
+                   int(getenv('HBNB_SQLITE_BUSY_TIMEOUT', '5000'))),
+               "PRAGMA cache_size={:d}".format(
+                   int(getenv('HBNB_SQLITE_CACHE_SIZE', '-65536')))]
+    if url.split("/")[-1] not in ("", ":memory:"):
+        pragmas += ["PRAGMA journal_mode=WAL",
+                    "PRAGMA synchronous={}".format(
+                        getenv('HBNB_SQLITE_SYNCHRONOUS', 'NORMAL')),
+                    "PRAGMA mmap_size={:d}".format(
+                        int(getenv('HBNB_SQLITE_MMAP_SIZE', '268435456')))]
+    return pragmas
+
+
+def object_cache():
+    """Returns the ObjectCache of the objects read by get(), or None
+
+    The cache holds up to HBNB_DB_CACHE_SIZE objects (0, the default,
+    disables it) and HBNB_DB_CACHE_BYTES bytes, each for at most
+    HBNB_DB_CACHE_TTL seconds.
+    """
+    size = int(getenv('HBNB_DB_CACHE_SIZE', '0'))
+    if size < 1:
+        return None
+    return ObjectCache(size, float(getenv('HBNB_DB_CACHE_TTL', '60')),
+                       int(getenv('HBNB_DB_CACHE_BYTES', '67108864')))
+
+
+def cache_key(obj):
+    """Returns the <class name>.<id> key of obj"""
+    return "{}.{}".format(obj.__class__.__name__, obj.id)
 
 
 class DBStorage:
@@ -32,20 +109,117 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        url = getenv('HBNB_DB_URL') or 'mysql+mysqldb://{}:{}@{}/{}'.format(
+            HBNB_MYSQL_USER, HBNB_MYSQL_PWD, HBNB_MYSQL_HOST, HBNB_MYSQL_DB)
+        self.__engine = create_engine(url, **pool_options(url))
+        self.__cache = object_cache()
+        self.__watch_pool()
+        if url.startswith("sqlite"):
+            pragmas = sqlite_pragmas(url)
+
+            def on_connect(dbapi_connection, record):
+                """applies the pragmas to a new SQLite connection"""
+                cursor = dbapi_connection.cursor()
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+                cursor.close()
+            event.listen(self.__engine, "connect", on_connect)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def __watch_pool(self):
+        """counts the connections and checkouts of the engine's pool, and
+        times how long checkouts wait and connections are held"""
+        lock = threading.Lock()
+        stats = {"connects": 0, "checkouts": 0, "checkins": 0,
+                 "invalidations": 0, "wait_ms_total": 0.0,
+                 "wait_ms_max": 0.0, "held_ms_total": 0.0,
+                 "held_ms_max": 0.0}
+        self.__pool_stats = stats
+        pool = self.__engine.pool
+        connect = pool.connect
+
+        def timed_connect():
+            """checks a connection out of the pool and records how long
+            the caller waited for it"""
+            started = time.monotonic()
+            try:
+                return connect()
+            finally:
+                waited = (time.monotonic() - started) * 1000
+                with lock:
+                    stats["wait_ms_total"] += waited
+                    stats["wait_ms_max"] = max(stats["wait_ms_max"], waited)
+        pool.connect = timed_connect
+
+        def on_connect(dbapi_connection, record):
+            """counts a new DBAPI connection"""
+            with lock:
+                stats["connects"] += 1
+
+        def on_checkout(dbapi_connection, record, proxy):
+            """counts a checkout and records when it happened"""
+            record.info["checked_out_at"] = time.monotonic()
+            with lock:
+                stats["checkouts"] += 1
+
+        def on_checkin(dbapi_connection, record):
+            """counts a checkin and how long the connection was held"""
+            started = record.info.pop("checked_out_at", None)
+            with lock:
+                stats["checkins"] += 1
+                if started is not None:
+                    held = (time.monotonic() - started) * 1000
+                    stats["held_ms_total"] += held
+                    stats["held_ms_max"] = max(stats["held_ms_max"], held)
+
+        def on_invalidate(dbapi_connection, record, exception):
+            """counts a connection discarded as stale or broken"""
+            with lock:
+                stats["invalidations"] += 1
+
+        event.listen(self.__engine, "connect", on_connect)
+        event.listen(self.__engine, "checkout", on_checkout)
+        event.listen(self.__engine, "checkin", on_checkin)
+        event.listen(self.__engine, "invalidate", on_invalidate)
+
+    def pool_stats(self):
+        """Report on the connection pool of the engine.
+
+        Returns:
+            dict: Pool size, connections currently checked out and in
+            overflow, and the connects, checkouts, checkins, invalidations,
+            checkout wait times (ms) and connection hold times (ms)
+            counted since startup.
+        """
+        pool = self.__engine.pool
+        stats = dict(self.__pool_stats)
+        for name in ["size", "checkedout", "overflow", "checkedin"]:
+            method = getattr(pool, name, None)
+            stats[name] = method() if callable(method) else None
+        if stats["checkouts"]:
+            stats["wait_ms_avg"] = stats["wait_ms_total"] / stats["checkouts"]
+        else:
+            stats["wait_ms_avg"] = 0.0
+        if stats["checkins"]:
+            stats["held_ms_avg"] = stats["held_ms_total"] / stats["checkins"]
+        else:
+            stats["held_ms_avg"] = 0.0
+        return stats
+
+    def all(self, cls=None, load=()):
+        """query on the current database session
+
+        load names relationships of cls loaded along with its objects,
+        in one extra query each rather than one per object.
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                options = [selectinload(getattr(classes[clss], name))
+                           for name in load]
+                objs = self.__session.query(classes[clss]).options(
+                    *options).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -54,6 +228,44 @@ class DBStorage:
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        if self.__cache is not None:
+            self.__cache.invalidate(cache_key(obj))
+
+    def bulk_new(self, objs):
+        """Add several objects to storage at once.
+
+        Args:
+            objs (list): Objects to add; inserted by the next save() with
+            one executemany INSERT per table.
+        """
+        self.__session.add_all(objs)
+
+    def bulk_update(self, cls, mappings):
+        """Update several objects of a class at once.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+            mappings (list): Dictionaries holding the id of an object and
+            the attributes to set on it; id, created_at, updated_at and
+            __class__ are not updated.
+
+        Returns:
+            dict: Updated objects by ID; persisted by the next save().
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return {}
+        by_id = {mapping.get("id"): mapping for mapping in mappings}
+        query = self.__session.query(cls).filter(cls.id.in_(list(by_id)))
+        updated = {}
+        for obj in query:
+            for key, value in by_id[obj.id].items():
+                if key not in bulk_ignored:
+                    setattr(obj, key, value)
+            obj.updated_at = datetime.utcnow()
+            updated[obj.id] = obj
+        return updated
 
     def save(self):
         """commit all changes of the current database session"""
@@ -63,36 +275,185 @@ class DBStorage:
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            if self.__cache is not None:
+                self.__cache.invalidate(cache_key(obj))
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        self.__create_missing_indexes()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        if self.__cache is not None:
+            self.__watch_session(sess_factory)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def __create_missing_indexes(self):
+        """creates the indexes declared by the models that are missing
+        from tables created before they were declared, which
+        create_all() leaves untouched"""
+        inspector = sqlalchemy.inspect(self.__engine)
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"]
+                        for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(self.__engine)
+
+    def __watch_session(self, sess_factory):
+        """invalidates the cached objects changed by the sessions of
+        sess_factory when they are flushed, and again once committed, so
+        that no other thread caches them as read in between"""
+        cache = self.__cache
+        affected = self.__affected
+
+        def on_flush(session, flush_context):
+            """invalidates the objects about to be written"""
+            keys = set()
+            for obj in (session.new | session.dirty | session.deleted):
+                keys.update(affected(obj))
+            cache.invalidate(*keys)
+            session.info.setdefault("cache_keys", set()).update(keys)
+
+        def on_end(session):
+            """invalidates the objects written by the transaction"""
+            cache.invalidate(*session.info.pop("cache_keys", ()))
+
+        event.listen(sess_factory, "after_flush", on_flush)
+        event.listen(sess_factory, "after_commit", on_end)
+        event.listen(sess_factory, "after_rollback", on_end)
+
+    @staticmethod
+    def __affected(obj):
+        """returns the keys of obj and of the objects whose cached
+        relationships obj is added to or removed from"""
+        state = sqlalchemy.inspect(obj)
+        keys = {cache_key(obj)}
+        for rel in state.mapper.relationships:
+            if rel.uselist:
+                history = get_history(obj, rel.key, PASSIVE_NO_INITIALIZE)
+                keys.update(cache_key(child) for child
+                            in list(history.added or ()) +
+                            list(history.deleted or ()))
+                continue
+            name = rel.mapper.class_.__name__
+            for column in rel.local_columns:
+                prop = state.mapper.get_property_by_column(column)
+                history = get_history(obj, prop.key, PASSIVE_NO_INITIALIZE)
+                keys.update("{}.{}".format(name, value)
+                            for value in history.sum() if value is not None)
+        return keys
+
+    def __store(self, obj, version, relations=True):
+        """caches the columns of obj, a clean persistent object, and the
+        keys and columns of the objects of its loaded relationships,
+        unless they were invalidated since the cache was at version"""
+        state = sqlalchemy.inspect(obj)
+        mapper = state.mapper
+        if not state.persistent or state.modified:
+            return
+        unloaded = state.unloaded
+        columns = {}
+        for attr in mapper.column_attrs:
+            if attr.key in unloaded:
+                return
+            columns[attr.key] = state.dict[attr.key]
+        related = {}
+        for rel in mapper.relationships:
+            if relations and rel.uselist and rel.key not in unloaded:
+                children = list(state.dict.get(rel.key) or ())
+                for child in children:
+                    self.__store(child, version, relations=False)
+                related[rel.key] = [cache_key(child) for child in children]
+        self.__cache.put(cache_key(obj), {"columns": columns,
+                                          "relations": related}, version)
+
+    def __rebuild(self, cls, id):
+        """returns the object of cls with id from the session, or built
+        from its cached columns and added to the session, or None"""
+        obj = self.__session.identity_map.get(identity_key(cls, id))
+        if obj is not None:
+            return obj
+        entry = self.__cache.get("{}.{}".format(cls.__name__, id))
+        if entry is None:
+            return None
+        obj = sqlalchemy.inspect(cls).class_manager.new_instance()
+        for key, value in entry["columns"].items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        self.__session.add(obj)
+        return obj
+
+    def __cached(self, cls, id, load):
+        """returns the object of cls with id and its relationships load
+        without querying the database, or None when one of them is not
+        cached"""
+        if self.__session.identity_map.get(identity_key(cls, id)) is not None:
+            return None
+        entry = self.__cache.get("{}.{}".format(cls.__name__, id))
+        if entry is None or not set(load) <= set(entry["relations"]):
+            return None
+        related = {}
+        for name in load:
+            child_cls = getattr(cls, name).property.mapper.class_
+            related[name] = []
+            for key in entry["relations"][name]:
+                child = self.__rebuild(child_cls, key.split(".", 1)[1])
+                if child is None:
+                    return None
+                related[name].append(child)
+        obj = self.__rebuild(cls, id)
+        for name, children in related.items():
+            set_committed_value(obj, name, children)
+        return obj
+
+    def cache_stats(self):
+        """Report on the object cache of get().
+
+        Returns:
+            dict or None: Hits, misses, evictions, expirations and
+            invalidations counted since startup, the hit ratio and the
+            entries and bytes cached; None when the cache is disabled.
+        """
+        if self.__cache is None:
+            return None
+        return self.__cache.stats()
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=()):
         """Retrieve an object from storage by class and ID.
 
         Args:
             cls (type or str): Class type or name of the object to retrieve.
             id (str): ID of the object to retrieve.
+            load (tuple, optional): Names of relationships of cls to load
+            along with the object, in one extra query each.
+
+        With HBNB_DB_CACHE_SIZE set, the object and its relationships are
+        first looked up in the object cache, and cached once queried.
 
         Returns:
             object or None: Returns the object with the specified ID
             belonging to the specified class type or name, if found.
             Returns None if no such object exists.
         """
-        if cls:
-            for obj in self.all(cls).values():
-                if cls == obj.__class__ or cls == obj.__class__.__name__:
-                    if id == obj.id:
-                        return obj
-        return None
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values() or id is None:
+            return None
+        if self.__cache is not None:
+            obj = self.__cached(cls, id, load)
+            if obj is not None:
+                return obj
+            version = self.__cache.version()
+        options = [selectinload(getattr(cls, name)) for name in load]
+        obj = self.__session.get(cls, id, options=options)
+        if obj is not None and self.__cache is not None:
+            self.__store(obj, version)
+        return obj
 
     def count(self, cls=None):
         """Count the number of objects in storage.
@@ -105,6 +466,144 @@ class DBStorage:
             int: Number of objects in storage matching the specified class
             type or all objects if class type is not specified.
         """
-        if cls:
-            return len(self.all(cls))
-        return len(self.all())
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls is None:
+            return sum(self.counts().values())
+        if cls not in classes.values():
+            return 0
+        query = select(func.count()).select_from(cls)
+        return self.__session.execute(query).scalar()
+
+    def counts(self, clss=None):
+        """Count the objects of several classes in a single query.
+
+        Args:
+            clss (list, optional): Class types or names of objects to
+            count. Defaults to None, counting every class.
+
+        Returns:
+            dict: Number of objects in storage by class name.
+        """
+        if clss is None:
+            clss = list(classes)
+        names = [c if isinstance(c, str) else c.__name__ for c in clss]
+        known = [name for name in names if name in classes]
+        counts = dict.fromkeys(names, 0)
+        if known:
+            query = select(*[select(func.count())
+                             .select_from(classes[name])
+                             .scalar_subquery().label(name)
+                             for name in known])
+            row = self.__session.execute(query).one()
+            counts.update(zip(known, row))
+        return counts
+
+    def generation(self, cls):
+        """Return a token that changes whenever objects of a class change.
+
+        The database is shared by every process and no counter of its
+        changes is kept, so there is no token that could be read without
+        a query of its own.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+
+        Returns:
+            None: Lists must be compared by their content instead.
+        """
+        return None
+
+    def page(self, cls, limit=None, cursor=None):
+        """Retrieve a page of objects of a class in (created_at, id) order.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+            limit (int, optional): Maximum number of objects to return.
+            Defaults to None, returning every remaining object.
+            cursor (tuple, optional): (created_at, id) of the last object
+            of the previous page. Defaults to None, starting from the
+            first object.
+
+        Returns:
+            list: Objects of cls following cursor.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls).order_by(cls.created_at, cls.id)
+        if cursor:
+            created_at, obj_id = cursor
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > obj_id)))
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def iter(self, cls=None, batch_size=1000):
+        """Iterate over the objects of a class, batch_size rows at a time.
+
+        Args:
+            cls (type or str, optional): Class type or name of the
+            objects. Defaults to None, iterating over every object.
+            batch_size (int, optional): Number of rows fetched at once.
+
+        Yields:
+            object: Objects of cls, read with a server-side cursor.
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(classes[clss]).execution_options(
+                    stream_results=True)
+                for obj in query.yield_per(batch_size):
+                    yield obj
+
+    def children(self, parent_cls, parent_id, child_cls):
+        """Retrieve the objects of a class referencing a parent object.
+
+        Args:
+            parent_cls (type or str): Class type or name of the parent,
+            whose lowercase name followed by "_id" is the foreign key.
+            parent_id (str): ID of the parent object.
+            child_cls (type or str): Class type or name of the children.
+
+        Returns:
+            list: Objects of child_cls whose foreign key is parent_id.
+        """
+        if not isinstance(parent_cls, str):
+            parent_cls = parent_cls.__name__
+        if isinstance(child_cls, str):
+            child_cls = classes.get(child_cls)
+        fk = getattr(child_cls, parent_cls.lower() + "_id", None)
+        if child_cls not in classes.values() or fk is None:
+            return []
+        return self.__session.query(child_cls).filter(fk == parent_id).all()
+
+    def search_places(self, state_ids=(), city_ids=(), amenity_ids=()):
+        """Retrieve the places matching the /places_search criteria.
+
+        Args:
+            state_ids (list): IDs of states whose cities' places match.
+            city_ids (list): IDs of cities whose places match, on top of
+            the ones of state_ids. All places match when both are empty.
+            amenity_ids (list): IDs of amenities every place must have.
+
+        Returns:
+            list: Place objects matching the criteria.
+        """
+        query = self.__session.query(Place)
+        if state_ids or city_ids:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(state_ids), City.id.in_(city_ids)))
+        amenity_ids = set(amenity_ids)
+        if amenity_ids:
+            from models.place import place_amenity
+            amenity_id = place_amenity.c.amenity_id
+            having = select(place_amenity.c.place_id).where(
+                amenity_id.in_(amenity_ids)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(distinct(amenity_id)) == len(amenity_ids))
+            query = query.filter(Place.id.in_(having))
+        return query.all()
@@ -3,10 +3,19 @@
 Contains the FileStorage class
 """
 
-import json
+from bisect import bisect_right
+from datetime import datetime
+import os
+from os import getenv
+import uuid
+from zlib import crc32
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, mark_dirty, peek_dirty, take_dirty
 from models.city import City
+from models.engine.codec import get_codec
+from models.engine.journal import Journal
+from models.engine.lock import StoreLock
+from models.engine.mapped import MappedSnapshot
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -14,6 +23,8 @@ from models.user import User
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes bulk_update() leaves untouched
+bulk_ignored = ("id", "created_at", "updated_at", "__class__")
 
 
 class FileStorage:
@@ -23,58 +34,592 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - objects of __objects by <class name>, then by key
+    __by_class = {}
+    # dictionary - the __objects dictionary __by_class was built from
+    __indexed = None
+    # boolean - whether the index was rebuilt since the last save, which
+    # then serializes every object again
+    __rebuilt = False
+    # dictionary - sorted (created_at, id) pairs of __by_class by class name
+    __sorted = {}
+    # dictionary - objects referencing a parent by (<class name>,
+    # <foreign key>, <parent id>), then by key
+    __children = {}
+    # dictionary - the __children entries each key is listed under
+    __links = {}
+    # tuple - foreign key attributes indexed in __children
+    __foreign_keys = ("state_id", "city_id", "place_id", "user_id")
+    # tuple - attributes holding lists of foreign keys indexed in __children
+    __foreign_key_lists = ("amenity_ids",)
+    # dictionary - stored record of each object as of the last read/write
+    __records = {}
+    # tuple - (inode, size, mtime) of the files as of the last read/write
+    __signature = None
+    # string - "journal" appends the changes made by save() to a journal
+    # next to __file_path, which is only rewritten on compaction;
+    # "sharded" stores each class in its own files, read on first use;
+    # "mapped" maps a snapshot in memory and decodes objects on first use
+    __mode = getenv("HBNB_FILE_MODE", "json")
+    # string - when to fsync: "always", "compact" or "never"
+    __fsync = getenv("HBNB_FILE_FSYNC", "compact")
+    # integer - number of journal records that triggers a compaction
+    __compact_every = int(getenv("HBNB_FILE_COMPACT", "1000"))
+    # Journal - journal of __file_path, when __mode is "journal"
+    __journal = None
+    # codec - format of the snapshot and shard files
+    __codec = get_codec(getenv("HBNB_FILE_CODEC", "json"))
+    # integer - number of files the objects of a class are spread over by
+    # id hash when __mode is "sharded"
+    __buckets = int(getenv("HBNB_FILE_BUCKETS", "1"))
+    # dictionary - (signature, records) of each shard file read or written
+    __shards = {}
+    # set - names of the classes whose shard files or mapped records were
+    # read
+    __loaded = set()
+    # MappedSnapshot - snapshot of __file_path, when __mode is "mapped"
+    __mapped = None
+    # StoreLock - lock shared with the other processes using __file_path
+    __lock = None
+    # integer - generation of the store as of the last read/write
+    __generation = None
+    # dictionary - number of changes made to the objects of each class
+    # by this process
+    __generations = {}
+    # string - distinguishes the generations of this process from the
+    # ones of other processes
+    __nonce = uuid.uuid4().hex
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=()):
+        """returns the dictionary __objects, or the objects of cls; load,
+        the relationships to load along, is ignored as related objects
+        are in memory"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            self.__load(self.__name(cls))
+            return dict(self.__index().get(self.__name(cls), {}))
+        self.__load(*classes)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            if self.__mode == "sharded":
+                self.__load(obj.__class__.__name__)
+            self.__put(key, obj)
+            mark_dirty(obj)
+
+    def __put(self, key, obj):
+        """sets obj at key in __objects and in the class index"""
+        by_class = self.__index()
+        self.__objects[key] = obj
+        by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        self.__sorted.pop(obj.__class__.__name__, None)
+        self.__bump(obj.__class__.__name__)
+        self.__link(key, obj)
+
+    def __pop(self, key):
+        """removes key from __objects and from the class index"""
+        by_class = self.__index()
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            by_class.get(obj.__class__.__name__, {}).pop(key, None)
+            self.__sorted.pop(obj.__class__.__name__, None)
+            self.__bump(obj.__class__.__name__)
+            self.__link(key, None)
+
+    def __link(self, key, obj):
+        """lists obj at key under the parents its foreign keys reference,
+        or unlists key when obj is None"""
+        links = ()
+        if obj is not None:
+            name = obj.__class__.__name__
+            links = [(name, fk, getattr(obj, fk))
+                     for fk in self.__foreign_keys
+                     if getattr(obj, fk, None)]
+            for fks in self.__foreign_key_lists:
+                links.extend((name, fks, fk)
+                             for fk in getattr(obj, fks, None) or ())
+            links = tuple(links)
+        for link in self.__links.get(key, ()):
+            if link not in links:
+                children = self.__children.get(link, {})
+                children.pop(key, None)
+                if not children:
+                    self.__children.pop(link, None)
+        for link in links:
+            self.__children.setdefault(link, {})[key] = obj
+        if links:
+            self.__links[key] = links
+        else:
+            self.__links.pop(key, None)
+
+    def __index(self):
+        """returns the class index of __objects, rebuilding it when
+        __objects was replaced or modified without new()/delete()"""
+        by_class = self.__by_class
+        if (self.__indexed is not self.__objects or
+                sum(map(len, by_class.values())) != len(self.__objects)):
+            by_class = {}
+            FileStorage.__sorted = {}
+            FileStorage.__children = {}
+            FileStorage.__links = {}
+            for key, obj in self.__objects.items():
+                by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+                self.__link(key, obj)
+            FileStorage.__by_class = by_class
+            FileStorage.__indexed = self.__objects
+            FileStorage.__rebuilt = True
+            self.__bump(*self.__generations.keys() | by_class.keys())
+        return by_class
+
+    def __bump(self, *names):
+        """counts a change to the objects of the classes names"""
+        for name in names:
+            self.__generations[name] = self.__generations.get(name, 0) + 1
+
+    @staticmethod
+    def __name(cls):
+        """returns the name of cls, given as a class or a class name"""
+        if isinstance(cls, str):
+            return cls
+        return cls.__name__
+
+    def bulk_new(self, objs):
+        """Add several objects to storage at once.
+
+        Args:
+            objs (list): Objects to add; persisted by the next save().
+        """
+        for obj in objs:
+            self.new(obj)
+
+    def bulk_update(self, cls, mappings):
+        """Update several objects of a class at once.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+            mappings (list): Dictionaries holding the id of an object and
+            the attributes to set on it; id, created_at, updated_at and
+            __class__ are not updated.
+
+        Returns:
+            dict: Updated objects by ID; persisted by the next save().
+        """
+        updated = {}
+        for mapping in mappings:
+            obj = self.get(cls, mapping.get("id"))
+            if obj is not None:
+                for key, value in mapping.items():
+                    if key not in bulk_ignored:
+                        setattr(obj, key, value)
+                obj.updated_at = datetime.utcnow()
+                updated[obj.id] = obj
+        return updated
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only the objects added or assigned an attribute since the last
+        save are serialized again; the others keep their stored record.
+        The files are written while holding the store lock exclusively;
+        when another process committed since this one last read or wrote
+        them, its changes are read first and these are applied on top.
+        When writing fails, the objects taken as changed are marked dirty
+        again, so that the next save writes them.
+        """
+        lock = self.__get_lock()
+        with lock.exclusive():
+            if self.__mode == "sharded":
+                self.__load(*self.__index())
+            self.__index()
+            rebuilt = self.__rebuilt
+            taken = take_dirty()
+            try:
+                changes = self.__changes(taken)
+                self.__bump(*{key.split(".", 1)[0]
+                              for key, record in changes})
+                if lock.generation() != self.__generation:
+                    self.__refresh({key for key, record in changes})
+                if self.__mode == "sharded":
+                    self.__save_shards(changes)
+                elif self.__mode == "mapped":
+                    self.__save_mapped(changes)
+                else:
+                    self.__save_snapshot(changes)
+            except BaseException:
+                for obj in taken:
+                    mark_dirty(obj)
+                FileStorage.__rebuilt = rebuilt or self.__rebuilt
+                raise
+            FileStorage.__generation = lock.bump()
+
+    def __save_snapshot(self, changes):
+        """writes the snapshot, or journals changes in journal mode"""
+        if self.__mode == "journal":
+            self.__append(changes)
+        else:
+            records = dict(self.__records)
+            for key, record in changes:
+                if record is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = record
+            self.__write(records)
+            FileStorage.__records = records
+        FileStorage.__signature = self.__stat()
+
+    def __update_records(self, changes):
+        """applies changes, once written, to __records in place"""
+        for key, record in changes:
+            if record is None:
+                self.__records.pop(key, None)
+            else:
+                self.__records[key] = record
+
+    def __changes(self, taken):
+        """returns the (key, record) pairs of the objects whose record
+        differs from the stored one, and (key, None) for the stored keys
+        no longer in __objects
+
+        taken are the dirty instances, taken before being serialized, so
+        that an instance another thread assigns meanwhile is dirty again
+        for the next save."""
+        objects = self.__objects
+        records = self.__records
+        if self.__rebuilt:
+            keys = set(objects)
+            FileStorage.__rebuilt = False
+        else:
+            keys = objects.keys() - records.keys()
+            for obj in taken:
+                key = "{}.{}".format(obj.__class__.__name__,
+                                     getattr(obj, "id", None))
+                if objects.get(key) is obj:
+                    keys.add(key)
+        changes = []
+        for key in keys:
+            obj = objects[key]
+            record = obj.to_dict(include_password=True)
+            self.__link(key, obj)
+            if records.get(key) != record:
+                changes.append((key, record))
+        changes.extend((key, None) for key in records.keys() - objects.keys())
+        return changes
+
+    def __write(self, json_objects, path=None):
+        """writes json_objects as the snapshot at path, __snapshot() by
+        default, through a temporary file replacing it, so that neither
+        readers nor a crash ever see a partial snapshot"""
+        path = path or self.__snapshot()
+        with open(path + ".tmp", 'wb') as f:
+            f.write(self.__codec.dumps(json_objects))
+            if self.__fsync != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def __append(self, changes):
+        """journals changes, compacting the journal into a snapshot of
+        __records when it grows past __compact_every records, so that
+        saving costs in proportion to the changes until then"""
+        journal = self.__get_journal()
+        journal.append(changes)
+        self.__update_records(changes)
+        if len(journal) >= self.__compact_every:
+            self.__write(self.__records)
+            journal.truncate()
+
+    def __get_journal(self):
+        """returns the Journal of __file_path"""
+        path = self.__file_path + ".journal"
+        if self.__journal is None or self.__journal.path != path:
+            FileStorage.__journal = Journal(path)
+        self.__journal.fsync = self.__fsync == "always"
+        return self.__journal
+
+    def __read(self):
+        """returns the stored records, with the journal replayed on top"""
+        if self.__mode != "journal":
+            with open(self.__snapshot(), 'rb') as f:
+                return self.__codec.loads(f.read())
+        journal = self.__get_journal()
+        try:
+            with open(self.__snapshot(), 'rb') as f:
+                jo = self.__codec.loads(f.read())
+        except FileNotFoundError:
+            if not os.path.exists(journal.path):
+                raise
+            jo = {}
+        return journal.apply(jo)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects
+
+        The file is only parsed when its inode, size or mtime changed since
+        it was last read or written, and only the objects whose record
+        changed are rebuilt; objects whose record disappeared are dropped.
+        In sharded mode, only the shards already read are reloaded, and in
+        mapped mode only the objects already decoded. The files are read
+        while holding the store lock shared.
+        """
+        with self.__get_lock().shared():
+            self.__refresh()
+
+    def __refresh(self, keep=None):
+        """reads the changes stored by other processes into __objects
+
+        The objects of the keys in keep, whose changes are about to be
+        written, are left alone; the stored files are then read even when
+        their signature did not change.
+
+        The files are only skipped when the generation of the store lock,
+        bumped by every commit, and their (inode, size, mtime) signature
+        are both unchanged: a commit may leave the same signature behind.
+        The generation is recorded once the files were read.
+        """
+        generation = self.__get_lock().generation()
+        changed = generation != self.__generation
+        if self.__mode == "sharded":
+            read = True
+            for path in list(self.__shards):
+                read = self.__read_shard(path, keep, changed) and read
+            if read:
+                FileStorage.__generation = generation
+            return
+        signature = self.__stat()
+        if keep is None and not changed and signature == self.__signature:
+            return
+        try:
+            if self.__mode == "mapped":
+                jo = self.__read_mapped()
+            else:
+                jo = self.__read()
+        except (OSError, ValueError):
+            return
+        self.__apply(jo, self.__records, keep)
+        FileStorage.__records = jo
+        FileStorage.__signature = signature
+        FileStorage.__generation = generation
+
+    def __apply(self, jo, records, keep=None):
+        """rebuilds the objects whose record in jo differs from the one in
+        records, and drops the objects of records missing from jo, except
+        for the keys in keep"""
+        keep = keep or ()
+        for key, record in jo.items():
+            if key in keep:
+                continue
+            if key not in self.__objects or records.get(key) != record:
+                try:
+                    obj = classes[record["__class__"]].from_storage(record)
+                except KeyError:
+                    continue
+                self.__put(key, obj)
+        for key in records.keys() - jo.keys():
+            if key not in keep:
+                self.__pop(key)
+
+    def __stat(self, paths=None):
+        """returns the (inode, size, mtime) signature of the stored files,
+        or of the files at paths"""
+        if paths is None:
+            paths = [self.__snapshot()]
+            if self.__mode == "journal":
+                paths.append(self.__file_path + ".journal")
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(signature)
+
+    def __shard(self, name, id):
+        """returns the path of the shard file holding the object of class
+        name with id"""
+        return self.__shard_paths(name)[crc32(id.encode()) %
+                                        max(self.__buckets, 1)]
+
+    def __shard_paths(self, name):
+        """returns the paths of the shard files of class name, in the
+        directory named after __file_path"""
+        directory = os.path.splitext(self.__file_path)[0] + ".d"
+        if self.__buckets <= 1:
+            return [os.path.join(directory, name + self.__codec.extension)]
+        return [os.path.join(directory, "{}.{}{}".format(
+            name, bucket, self.__codec.extension))
+            for bucket in range(self.__buckets)]
+
+    def __snapshot(self):
+        """returns the path of the snapshot file: __file_path, with the
+        extension of __codec when it does not store JSON"""
+        if self.__mode == "mapped":
+            return os.path.splitext(self.__file_path)[0] + ".map"
+        if self.__codec.name == "json":
+            return self.__file_path
+        return os.path.splitext(self.__file_path)[0] + self.__codec.extension
+
+    def __load(self, *names):
+        """reads the objects of the classes names not read yet, in sharded
+        and mapped modes"""
+        if self.__mode not in ("sharded", "mapped"):
+            return
+        for name in names:
+            if name in self.__loaded:
+                continue
+            self.__loaded.add(name)
+            if self.__mode == "sharded":
+                for path in self.__shard_paths(name):
+                    self.__read_shard(path)
+            else:
+                mapped = self.__get_mapped()
+                self.__decode(mapped.get(key) for key in mapped.index(name))
+
+    def __load_key(self, name, key):
+        """decodes the mapped record of key alone, unless the objects of
+        class name were all read or key was already read or added, in
+        mapped mode"""
+        if self.__mode != "mapped" or name in self.__loaded:
+            return self.__load(name)
+        if key in self.__objects or key in self.__records:
+            return
+        self.__decode([self.__get_mapped().get(key)])
+
+    def __count(self, name, by_class):
+        """returns the number of objects of class name, counting from the
+        mapped index the stored records not read yet, in mapped mode"""
+        count = len(by_class.get(name, {}))
+        if self.__mode == "mapped" and name not in self.__loaded:
+            objects = self.__objects
+            records = self.__records
+            count += sum(1 for key in self.__get_mapped().index(name)
+                         if key not in records and key not in objects)
+        return count
+
+    def __decode(self, records):
+        """builds the objects of records, a mapped record being skipped
+        when None or when its key was already read or added"""
+        jo = {}
+        for record in records:
+            if record is None:
+                continue
+            key = "{}.{}".format(record.get("__class__"), record.get("id"))
+            if key not in self.__records and key not in self.__objects:
+                jo[key] = record
+        self.__apply(jo, {})
+        self.__records.update(jo)
+
+    def __get_mapped(self):
+        """returns the MappedSnapshot of __file_path, mapped on first use"""
+        path = self.__snapshot()
+        if self.__mapped is None or self.__mapped.path != path:
+            if self.__mapped is not None:
+                self.__mapped.close()
+            FileStorage.__mapped = MappedSnapshot(path, self.__codec).open()
+        self.__mapped.fsync = self.__fsync != "never"
+        return self.__mapped
+
+    def __get_lock(self):
+        """returns the StoreLock of __file_path"""
+        path = self.__file_path + ".lock"
+        if self.__lock is None or self.__lock.path != path:
+            FileStorage.__lock = StoreLock(path)
+        return self.__lock
+
+    def __read_mapped(self):
+        """maps the snapshot again and returns the records of the objects
+        already read"""
+        mapped = self.__mapped
+        if mapped is not None and mapped.path == self.__snapshot():
+            mapped.open()
+        else:
+            mapped = self.__get_mapped()
+        jo = {}
+        for key in self.__records:
+            record = mapped.get(key)
+            if record is not None:
+                jo[key] = record
+        for name in self.__loaded:
+            for key in mapped.index(name):
+                if key not in jo:
+                    jo[key] = mapped.get(key)
+        return jo
+
+    def __save_mapped(self, changes):
+        """rewrites the mapped snapshot with the changed records"""
+        mapped = self.__get_mapped()
+        if changes or not os.path.exists(mapped.path):
+            mapped.write(dict(changes))
+        self.__update_records(changes)
+        FileStorage.__signature = self.__stat()
+
+    def __read_shard(self, path, keep=None, force=False):
+        """reads the shard file at path when it changed since it was last
+        read or written, or when forced or keys to keep are given, and
+        returns whether it is up to date"""
+        signature = self.__stat([path])
+        known = self.__shards.get(path)
+        if (keep is None and not force and known is not None and
+                known[0] == signature):
+            return True
+        records = known[1] if known is not None else {}
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+            with open(path, 'rb') as f:
+                jo = self.__codec.loads(f.read())
+        except FileNotFoundError:
+            jo = {}
+        except (OSError, ValueError):
+            return False
+        self.__apply(jo, records, keep)
+        for key in records.keys() - jo.keys():
+            self.__records.pop(key, None)
+        self.__records.update(jo)
+        self.__shards[path] = (signature, jo)
+        return True
+
+    def __save_shards(self, changes):
+        """writes the shard files holding changed records"""
+        shards = {}
+        for key, record in changes:
+            name, id = key.split(".", 1)
+            path = self.__shard(name, id)
+            if path not in shards:
+                shards[path] = dict(self.__shards.get(path, (None, {}))[1])
+            if record is None:
+                shards[path].pop(key, None)
+            else:
+                shards[path][key] = record
+        for path, records in shards.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.__write(records, path)
+            self.__shards[path] = (self.__stat([path]), records)
+        for key, record in changes:
+            if record is None:
+                self.__records.pop(key, None)
+            else:
+                self.__records[key] = record
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            self.__pop(key)
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
         self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=()):
         """Retrieve an object from storage by class and ID.
 
         Args:
             cls (type or str): Class type or name of the object to retrieve.
             id (str): ID of the object to retrieve.
+            load (tuple, optional): Names of relationships to load along
+            with the object; ignored, as related objects are in memory.
 
         Returns:
             object or None: Returns the object with the specified ID
@@ -82,10 +627,10 @@ class FileStorage:
             Returns None if no such object exists.
         """
         if cls:
-            for obj in self.all(cls).values():
-                if cls == obj.__class__ or cls == obj.__class__.__name__:
-                    if id == obj.id:
-                        return obj
+            name = self.__name(cls)
+            key = "{}.{}".format(name, id)
+            self.__load_key(name, key)
+            return self.__index().get(name, {}).get(key)
         return None
 
     def count(self, cls=None):
@@ -100,5 +645,162 @@ class FileStorage:
             type or all objects if class type is not specified.
         """
         if cls:
-            return len(self.all(cls))
-        return len(self.all())
+            return self.counts([cls])[self.__name(cls)]
+        return sum(self.counts().values())
+
+    def counts(self, clss=None):
+        """Count the objects of several classes at once.
+
+        Args:
+            clss (list, optional): Class types or names of objects to
+            count. Defaults to None, counting every class.
+
+        Returns:
+            dict: Number of objects in storage by class name.
+        """
+        if clss is None:
+            clss = list(classes)
+        names = [self.__name(cls) for cls in clss]
+        if self.__mode != "mapped":
+            self.__load(*names)
+        by_class = self.__index()
+        return {name: self.__count(name, by_class) for name in names}
+
+    def generation(self, cls):
+        """Return a token that changes whenever objects of a class change.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+
+        Returns:
+            str: Token counting the objects of cls added, deleted, read
+            again or saved with changes by this process.
+        """
+        name = self.__name(cls)
+        self.__load(name)
+        self.__index()
+        return "{}-{}".format(self.__nonce, self.__generations.get(name, 0))
+
+    def page(self, cls, limit=None, cursor=None):
+        """Retrieve a page of objects of a class in (created_at, id) order.
+
+        Args:
+            cls (type or str): Class type or name of the objects.
+            limit (int, optional): Maximum number of objects to return.
+            Defaults to None, returning every remaining object.
+            cursor (tuple, optional): (created_at, id) of the last object
+            of the previous page. Defaults to None, starting from the
+            first object.
+
+        Returns:
+            list: Objects of cls following cursor.
+        """
+        name = self.__name(cls)
+        self.__load(name)
+        objs = self.__index().get(name, {})
+        order = self.__sorted.get(name)
+        if order is None:
+            order = sorted((obj.created_at, obj.id) for obj in objs.values())
+            self.__sorted[name] = order
+        start = bisect_right(order, cursor) if cursor else 0
+        stop = len(order) if limit is None else start + limit
+        return [objs[name + "." + obj_id]
+                for created_at, obj_id in order[start:stop]]
+
+    def iter(self, cls=None, batch_size=1000):
+        """Iterate over the objects of a class, batch_size keys at a time.
+
+        Args:
+            cls (type or str, optional): Class type or name of the
+            objects. Defaults to None, iterating over every object.
+            batch_size (int, optional): Number of keys looked up at once.
+
+        Yields:
+            object: Objects of cls still in storage when reached.
+        """
+        if cls is None:
+            self.__load(*classes)
+            objs = self.__objects
+        else:
+            self.__load(self.__name(cls))
+            objs = self.__index().get(self.__name(cls), {})
+        keys = list(objs)
+        for start in range(0, len(keys), batch_size):
+            for key in keys[start:start + batch_size]:
+                obj = objs.get(key)
+                if obj is not None:
+                    yield obj
+
+    def children(self, parent_cls, parent_id, child_cls):
+        """Retrieve the objects of a class referencing a parent object.
+
+        Args:
+            parent_cls (type or str): Class type or name of the parent,
+            whose lowercase name followed by "_id" is the foreign key.
+            parent_id (str): ID of the parent object.
+            child_cls (type or str): Class type or name of the children.
+
+        Returns:
+            list: Objects of child_cls whose foreign key is parent_id.
+        """
+        fk = self.__name(parent_cls).lower() + "_id"
+        name = self.__name(child_cls)
+        self.__load(name)
+        self.__index()
+        # objects assigned since the last save may reference new parents
+        for obj in peek_dirty():
+            if obj.__class__.__name__ != name:
+                continue
+            key = "{}.{}".format(name, getattr(obj, "id", None))
+            if self.__objects.get(key) is obj:
+                self.__link(key, obj)
+        children = []
+        link = (name, fk, parent_id)
+        for key, obj in list(self.__children.get(link, {}).items()):
+            if getattr(obj, fk, None) == parent_id:
+                children.append(obj)
+            else:
+                self.__link(key, obj)
+        return children
+
+    def search_places(self, state_ids=(), city_ids=(), amenity_ids=()):
+        """Retrieve the places matching the /places_search criteria.
+
+        Args:
+            state_ids (list): IDs of states whose cities' places match.
+            city_ids (list): IDs of cities whose places match, on top of
+            the ones of state_ids. All places match when both are empty.
+            amenity_ids (list): IDs of amenities every place must have.
+
+        Returns:
+            list: Place objects matching the criteria.
+        """
+        self.__load("Place")
+        self.__index()
+        if state_ids or city_ids:
+            city_ids = set(city_ids)
+            for state_id in state_ids:
+                if self.get("State", state_id) is not None:
+                    city_ids.update(city.id for city in
+                                    self.children("State", state_id, "City"))
+            places = {}
+            for city_id in city_ids:
+                if self.get("City", city_id) is not None:
+                    for place in self.children("City", city_id, "Place"):
+                        places[place.id] = place
+        else:
+            places = {obj.id: obj for obj in self.all("Place").values()}
+        amenity_ids = set(amenity_ids)
+        postings = sorted((self.__children.get(("Place", "amenity_ids",
+                                                amenity_id), {})
+                           for amenity_id in amenity_ids), key=len)
+        for posting in postings:
+            if len(posting) < len(places):
+                places = {place.id: place for place in posting.values()
+                          if place.id in places}
+            else:
+                places = {place_id: place
+                          for place_id, place in places.items()
+                          if "Place." + place_id in posting}
+        return [place for place in places.values()
+                if amenity_ids.issubset(place.amenity_ids)]
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+import os
+
+
+class Journal:
+    """append-only log of the objects upserted into or deleted from storage
+
+    Each line of the journal is a JSON record, either
+    {"op": "put", "key": <class name>.id, "value": <to_dict()>} or
+    {"op": "del", "key": <class name>.id}.
+
+    An interrupted append leaves an incomplete last line, which replay
+    ignores and the next append cuts off before writing.
+    """
+
+    def __init__(self, path, fsync=False):
+        """Instantiate a Journal appending to the file at path"""
+        self.path = path
+        self.fsync = fsync
+        self.__size = None
+
+    def __len__(self):
+        """returns the number of records currently in the journal"""
+        if self.__size is None:
+            self.__size = 0
+            for op in self.replay():
+                self.__size += 1
+        return self.__size
+
+    def append(self, changes):
+        """appends one record per (key, value) pair of changes
+
+        A value of None records the deletion of key.
+        """
+        lines = []
+        for key, value in changes:
+            if value is None:
+                record = {"op": "del", "key": key}
+            else:
+                record = {"op": "put", "key": key, "value": value}
+            lines.append(json.dumps(record) + "\n")
+        if not lines:
+            return
+        with open(self.path, 'a+b') as f:
+            self.__cut_torn_tail(f)
+            f.write("".join(lines).encode())
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if self.__size is not None:
+            self.__size += len(lines)
+
+    @staticmethod
+    def __cut_torn_tail(f):
+        """truncates the journal open as f after its last newline"""
+        end = f.seek(0, os.SEEK_END)
+        size = end
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+
+    def replay(self):
+        """yields the (key, value) pairs recorded in the journal
+
+        A value of None stands for a deletion. Replay stops at the first
+        incomplete record or line, which is what an interrupted append
+        leaves.
+        """
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record.get("op") == "del":
+                    yield record["key"], None
+                else:
+                    yield record["key"], record["value"]
+
+    def apply(self, records):
+        """replays the journal on top of the records dictionary"""
+        self.__size = 0
+        for key, value in self.replay():
+            self.__size += 1
+            if value is None:
+                records.pop(key, None)
+            else:
+                records[key] = value
+        return records
+
+    def truncate(self):
+        """empties the journal once its records are in a snapshot"""
+        with open(self.path, 'w'):
+            pass
+        self.__size = 0
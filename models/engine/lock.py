@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the StoreLock class
+"""
+
+from contextlib import contextmanager
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class StoreLock:
+    """advisory reader/writer lock shared by the processes using a store
+
+    The lock is an flock on a lock file, which also holds the generation
+    of the store: the number of commits made to it, bumped by each writer.
+    A process that remembers the generation it last read or wrote can tell
+    whether another process committed since. Where fcntl is unavailable,
+    only the threads of the process are serialized. When the lock file can
+    neither be created nor opened, as in a missing or read-only directory,
+    nothing is locked and the generation is None.
+    """
+
+    def __init__(self, path):
+        """Instantiate a StoreLock on the lock file at path"""
+        self.path = path
+        self.__fd = None
+        self.__pid = None
+        self.__depth = 0
+        self.__thread_lock = threading.RLock()
+
+    def __open(self):
+        """returns the descriptor of the lock file, opened by this process
+        so that its flocks are not shared with a parent process, or None
+        when the file cannot be opened"""
+        if self.__fd is None or self.__pid != os.getpid():
+            try:
+                self.__fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                try:
+                    self.__fd = os.open(self.path, os.O_RDONLY)
+                except OSError:
+                    return None
+            self.__pid = os.getpid()
+        return self.__fd
+
+    @contextmanager
+    def __hold(self, operation):
+        """holds the lock with the flock operation; nested holds by the
+        same thread keep the outermost lock"""
+        with self.__thread_lock:
+            fd = self.__open() if fcntl is not None else None
+            if self.__depth == 0 and fd is not None:
+                fcntl.flock(fd, operation)
+            self.__depth += 1
+            try:
+                yield self
+            finally:
+                self.__depth -= 1
+                if self.__depth == 0 and fd is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def shared(self):
+        """returns a context holding the lock for reading"""
+        return self.__hold(fcntl.LOCK_SH if fcntl is not None else None)
+
+    def exclusive(self):
+        """returns a context holding the lock for writing"""
+        return self.__hold(fcntl.LOCK_EX if fcntl is not None else None)
+
+    def generation(self):
+        """returns the generation recorded in the lock file, or None when
+        there is no lock file"""
+        with self.__thread_lock:
+            fd = self.__open()
+            if fd is None:
+                return None
+            os.lseek(fd, 0, os.SEEK_SET)
+            data = os.read(fd, 32)
+        try:
+            return int(data or 0)
+        except ValueError:
+            return 0
+
+    def bump(self):
+        """records and returns the next generation, while the lock is held
+        for writing, or None when there is no lock file"""
+        with self.__thread_lock:
+            generation = self.generation()
+            if generation is None:
+                return None
+            generation += 1
+            data = "{}\n".format(generation).encode()
+            fd = self.__open()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, data)
+            os.ftruncate(fd, len(data))
+        return generation
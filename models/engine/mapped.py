@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the MappedSnapshot class
+"""
+
+import mmap
+import os
+import struct
+from models.engine.codec import get_codec
+
+MAGIC = b"HBNBMAP1"
+# offset and length of the directory, just before the trailing MAGIC
+FOOTER = struct.Struct(">QQ")
+
+
+class MappedSnapshot:
+    """snapshot file mapped in memory, whose records are decoded on demand
+
+    The file holds MAGIC, then each record encoded on its own by the codec
+    as {key: record}, then one JSON index per class mapping the keys of
+    its records to their [offset, length], then a JSON directory mapping
+    each class name to the [offset, length] of its index, and finally the
+    FOOTER locating the directory followed by MAGIC. Opening the file only
+    decodes the directory; class indexes are decoded on first use.
+    """
+
+    def __init__(self, path, codec):
+        """Instantiate a MappedSnapshot of the file at path"""
+        self.path = path
+        self.codec = codec
+        self.fsync = False
+        self.__json = get_codec("json")
+        self.__map = None
+        self.__directory = {}
+        self.__indexes = {}
+
+    def open(self):
+        """maps the file at path, which may not exist yet"""
+        self.close()
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return self
+        with f:
+            if os.fstat(f.fileno()).st_size < 2 * len(MAGIC) + FOOTER.size:
+                raise ValueError("not a mapped snapshot: " + self.path)
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        end = len(self.__map) - len(MAGIC)
+        if (self.__map[:len(MAGIC)] != MAGIC or
+                self.__map[end:] != MAGIC):
+            self.close()
+            raise ValueError("not a mapped snapshot: " + self.path)
+        offset, length = FOOTER.unpack_from(self.__map, end - FOOTER.size)
+        self.__directory = self.__json.loads(
+            self.__map[offset:offset + length])
+        return self
+
+    def close(self):
+        """unmaps the file"""
+        if self.__map is not None:
+            self.__map.close()
+        self.__map = None
+        self.__directory = {}
+        self.__indexes = {}
+
+    def index(self, name):
+        """returns the {key: [offset, length]} index of the records of
+        class name"""
+        if name not in self.__indexes:
+            index = {}
+            if name in self.__directory:
+                offset, length = self.__directory[name]
+                index = self.__json.loads(self.__map[offset:offset + length])
+            self.__indexes[name] = index
+        return self.__indexes[name]
+
+    def get(self, key):
+        """returns the record stored at key, or None"""
+        entry = self.index(key.split(".", 1)[0]).get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self.codec.loads(self.__map[offset:offset + length])[key]
+
+    def write(self, changes):
+        """replaces the file with the stored records updated with the
+        {key: record} changes, where a record of None deletes key, and
+        maps the new file
+
+        Unchanged records are copied without being decoded.
+        """
+        names = set(self.__directory)
+        names.update(key.split(".", 1)[0] for key in changes)
+        directory = {}
+        tmp = self.path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC)
+            offset = len(MAGIC)
+            indexes = {}
+            for name in sorted(names):
+                index = {}
+                for key, (start, length) in self.index(name).items():
+                    if key not in changes:
+                        f.write(self.__map[start:start + length])
+                        index[key] = [offset, length]
+                        offset += length
+                for key, record in changes.items():
+                    if record is not None and key.split(".", 1)[0] == name:
+                        data = self.codec.dumps({key: record})
+                        f.write(data)
+                        index[key] = [offset, len(data)]
+                        offset += len(data)
+                indexes[name] = index
+            for name, index in indexes.items():
+                data = self.__json.dumps(index)
+                f.write(data)
+                directory[name] = [offset, len(data)]
+                offset += len(data)
+            data = self.__json.dumps(directory)
+            f.write(data)
+            f.write(FOOTER.pack(offset, len(data)) + MAGIC)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        return self.open()
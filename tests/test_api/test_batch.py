@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatch classes
+"""
+import models
+import pep8
+import unittest
+from models.state import State
+from api.v1.app import app
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the batch views"""
+    def test_pep8_conformance_batch(self):
+        """Test that batch.py and test_batch.py conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py',
+                                    'tests/test_api/test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestBatch(unittest.TestCase):
+    """Test the POST /api/v1/<resource>/batch endpoint"""
+    def setUp(self):
+        """Create a test client"""
+        self.client = app.test_client()
+        self.created = []
+
+    def tearDown(self):
+        """Delete the objects created by the test"""
+        for cls, obj_id in reversed(self.created):
+            obj = models.storage.get(cls, obj_id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def post(self, resource, items):
+        """Post items to the batch endpoint of resource"""
+        response = self.client.post("/api/v1/{}/batch".format(resource),
+                                    json=items)
+        for result in response.get_json() or []:
+            if "object" in result:
+                obj = result["object"]
+                self.created.append((obj["__class__"], obj["id"]))
+        return response
+
+    def test_all_created(self):
+        """Test that valid items are created with status 201"""
+        response = self.post("states", [{"name": "California"},
+                                        {"name": "Nevada"}])
+        self.assertEqual(response.status_code, 201)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 201])
+        state = models.storage.get(State, results[1]["object"]["id"])
+        self.assertEqual(state.name, "Nevada")
+
+    def test_per_item_errors(self):
+        """Test that invalid items are reported without stopping others"""
+        response = self.post("states", [{"name": "California"}])
+        state_id = response.get_json()[0]["object"]["id"]
+        response = self.post("cities", [
+            {"name": "Fremont", "state_id": state_id},
+            {"state_id": state_id},
+            {"name": "Reno", "state_id": "missing"},
+            "Reno"])
+        self.assertEqual(response.status_code, 207)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 400, 404, 400])
+        self.assertEqual(results[1]["error"], "Missing name")
+        self.assertEqual(len(models.storage.get(State, state_id).cities), 1)
+
+    def test_invalid_attribute(self):
+        """Test that an item failing to build is reported as a 400"""
+        response = self.post("states", [
+            {"name": "California"},
+            {"name": "Nevada", "created_at": "bad"}])
+        self.assertEqual(response.status_code, 207)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 400])
+        self.assertIn("bad", results[1]["error"])
+        self.assertIsNotNone(
+            models.storage.get(State, results[0]["object"]["id"]))
+
+    def test_bad_requests(self):
+        """Test that unknown resources and non lists are rejected"""
+        self.assertEqual(self.post("nothing", []).status_code, 404)
+        self.assertEqual(self.post("states", {}).status_code, 400)
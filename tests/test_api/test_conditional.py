@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditional classes
+"""
+import inspect
+import models
+import pep8
+import unittest
+from datetime import timedelta
+from werkzeug.http import http_date
+from models.state import State
+from models.city import City
+from api.v1.app import app
+from api.v1.views import conditional
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the conditional module"""
+    def test_pep8_conformance_conditional(self):
+        """Test that conditional.py and test_conditional.py conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py',
+                                    'tests/test_api/test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test that the conditional module and functions have docstrings"""
+        self.assertIsNotNone(conditional.__doc__)
+        for name, func in inspect.getmembers(conditional,
+                                             inspect.isfunction):
+            if func.__module__ == conditional.__name__:
+                self.assertIsNotNone(func.__doc__,
+                                     '{} lacks a docstring'.format(name))
+
+
+class TestConditional(unittest.TestCase):
+    """Test the conditional GET requests of the API"""
+    def setUp(self):
+        """Create a test client and a state"""
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+        self.created = [self.state]
+
+    def tearDown(self):
+        """Delete the objects created by the test"""
+        for obj in reversed(self.created):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def test_object_etag(self):
+        """Test that a matching If-None-Match is answered with 304"""
+        url = "/api/v1/states/{}".format(self.state.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertIsNotNone(response.headers.get("Last-Modified"))
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.data, b"")
+
+    def test_object_modified_since(self):
+        """Test that If-Modified-Since is answered from updated_at"""
+        url = "/api/v1/states/{}".format(self.state.id)
+        later = http_date(self.state.updated_at + timedelta(seconds=1))
+        earlier = http_date(self.state.updated_at - timedelta(seconds=1))
+        response = self.client.get(url, headers={"If-Modified-Since": later})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url,
+                                   headers={"If-Modified-Since": earlier})
+        self.assertEqual(response.status_code, 200)
+
+    def test_put_changes_etag(self):
+        """Test that updating an object changes its ETag"""
+        url = "/api/v1/states/{}".format(self.state.id)
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.put(url, json={"name": "Nevada"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Nevada")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_list_etag(self):
+        """Test that a list is 304 until one of its objects changes"""
+        url = "/api/v1/states/{}/cities".format(self.state.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        city = City(name="Fremont", state_id=self.state.id)
+        city.save()
+        self.created.append(city)
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([city["name"] for city in response.get_json()],
+                         ["Fremont"])
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_list_etag_by_url(self):
+        """Test that lists of different urls have different ETags"""
+        state = State(name="Nevada")
+        state.save()
+        self.created.append(state)
+        first = self.client.get("/api/v1/states?limit=1")
+        second = self.client.get("/api/v1/states?limit=2")
+        self.assertNotEqual(first.headers["ETag"], second.headers["ETag"])
+
+    def test_list_not_found(self):
+        """Test that errors are not given an ETag"""
+        response = self.client.get("/api/v1/states/missing/cities")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Contains the TestEagerLoading classes
+"""
+import importlib
+import models
+import pep8
+import unittest
+from sqlalchemy import event
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from api.v1.app import app
+
+
+class TestEagerLoadingDocs(unittest.TestCase):
+    """Tests to check the style of the eager loading tests"""
+    def test_pep8_conformance_test_eager_loading(self):
+        """Test that test_eager_loading.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_eager_loading.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestEagerLoading(unittest.TestCase):
+    """Count the SQL statements emitted by the relationship endpoints"""
+    @classmethod
+    def setUpClass(cls):
+        """Create a state with cities, places, reviews and amenities"""
+        storage = models.storage
+        cls.user = User(email="a@b.c", password="pwd")
+        cls.state = State(name="California")
+        cls.objs = [cls.user, cls.state]
+        for i in range(3):
+            city = City(name=str(i), state_id=cls.state.id)
+            cls.objs.append(city)
+            for j in range(3):
+                place = Place(name=str(j), city_id=city.id,
+                              user_id=cls.user.id)
+                place.amenities.append(Amenity(name=str(j)))
+                cls.objs.append(place)
+                cls.objs.append(Review(text=str(j), place_id=place.id,
+                                       user_id=cls.user.id))
+        cls.city = city
+        cls.place = place
+        for obj in cls.objs:
+            storage.new(obj)
+        storage.save()
+        cls.client = app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Delete the objects created by setUpClass"""
+        storage = models.storage
+        for obj in reversed(cls.objs):
+            obj = storage.get(obj.__class__, obj.id)
+            if obj is not None:
+                storage.delete(obj)
+                storage.save()
+        storage.close()
+
+    def count_statements(self, url, client=None):
+        """Return the number of statements emitted while client, the API
+        client by default, serves url"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            """Record one statement"""
+            statements.append(statement)
+        models.storage.close()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = (client or self.client).get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(response.status_code, 200)
+        return len(statements)
+
+    def test_state_cities(self):
+        """Test that a state's cities are loaded with the state"""
+        url = "/api/v1/states/{}/cities".format(self.state.id)
+        self.assertLessEqual(self.count_statements(url), 2)
+
+    def test_city_places(self):
+        """Test that a city's places are loaded with the city"""
+        url = "/api/v1/cities/{}/places".format(self.city.id)
+        self.assertLessEqual(self.count_statements(url), 2)
+
+    def test_place_reviews(self):
+        """Test that a place's reviews are loaded with the place"""
+        url = "/api/v1/places/{}/reviews".format(self.place.id)
+        self.assertLessEqual(self.count_statements(url), 2)
+
+    def test_place_amenities(self):
+        """Test that a place's amenities are loaded with the place"""
+        url = "/api/v1/places/{}/amenities".format(self.place.id)
+        self.assertLessEqual(self.count_statements(url), 2)
+
+    def test_web_flask_state_cities(self):
+        """Test that the cities of the listed states are loaded at once"""
+        storage = models.storage
+        objs = []
+        for i in range(2):
+            state = State(name="Nevada" + str(i))
+            objs += [state, City(name="Reno", state_id=state.id)]
+        for obj in objs:
+            storage.new(obj)
+        storage.save()
+        try:
+            for module, url, cap in [
+                    ("web_flask.8-cities_by_states", "/cities_by_states", 2),
+                    ("web_flask.10-hbnb_filters", "/hbnb_filters", 3)]:
+                client = importlib.import_module(module).app.test_client()
+                with self.subTest(url=url):
+                    self.assertLessEqual(
+                        self.count_statements(url, client), cap)
+        finally:
+            for obj in reversed(objs):
+                storage.delete(storage.get(type(obj), obj.id))
+            storage.save()
+            storage.close()
@@ -2,6 +2,7 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
 import pep8 as pycodestyle
 import time
@@ -158,3 +159,47 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_setattr_marks_dirty(self):
+        """Test that assigning an attribute marks the instance dirty"""
+        inst = BaseModel()
+        self.assertIn(inst, models.base_model.dirty)
+        models.base_model.dirty.discard(inst)
+        inst.name = "Holberton"
+        self.assertIn(inst, models.base_model.dirty)
+        self.assertNotIn("dirty", inst.to_dict())
+
+    def test_from_storage(self):
+        """Test that from_storage rebuilds the instance of a record"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        inst.number = 89
+        copy = BaseModel.from_storage(inst.to_dict())
+        self.assertIsNot(copy, inst)
+        self.assertEqual(copy.to_dict(), inst.to_dict())
+        self.assertEqual(copy.created_at, inst.created_at)
+        self.assertEqual(type(copy.updated_at), datetime)
+        self.assertNotIn("__class__", copy.__dict__)
+        if models.storage_t != 'db':
+            self.assertNotIn(copy, models.base_model.dirty)
+
+    def test_to_dict_cached(self):
+        """Test that to_dict is reused until an attribute is assigned"""
+        inst = BaseModel()
+        first = inst.to_dict()
+        first["name"] = "changed by the caller"
+        second = inst.to_dict()
+        self.assertNotIn("name", second)
+        self.assertIsNot(first, second)
+        inst.name = "Holberton"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+
+    def test_to_json_bytes(self):
+        """Test that to_json_bytes encodes to_dict until an assignment"""
+        inst = BaseModel()
+        data = inst.to_json_bytes()
+        self.assertEqual(json.loads(data), inst.to_dict())
+        self.assertIs(inst.to_json_bytes(), data)
+        inst.name = "Holberton"
+        self.assertEqual(json.loads(inst.to_json_bytes())["name"],
+                         "Holberton")
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the TestObjectCacheDocs classes
+"""
+import unittest
+import inspect
+import pep8
+from unittest import mock
+from models.engine import cache
+ObjectCache = cache.ObjectCache
+
+
+class TestObjectCacheDocs(unittest.TestCase):
+    """
+       Tests to check the documentation and style of cache module,
+       the ObjectCache class and its methods.
+    """
+    def test_module_docstring(self):
+        """Test if the cache module has docstring."""
+        self.assertIsNotNone(cache.__doc__, 'cache lacks docstring')
+
+    def test_class_docstring(self):
+        """Test if the ObjectCache class has docstring."""
+        self.assertIsNotNone(ObjectCache.__doc__,
+                             'ObjectCache lacks docstring')
+
+    def test_method_docstrings(self):
+        """Test if all methods in ObjectCache class have docstrings."""
+        for name, method in inspect.getmembers(ObjectCache,
+                                               predicate=inspect.isfunction):
+            self.assertIsNotNone(
+                method.__doc__, '{} method lacks a docstring'.format(name))
+
+    def test_pep8_compliance_cache(self):
+        """Test that cache and test_cache conform to PEP 8."""
+        style = pep8.StyleGuide(quiet=True)
+        result = style.check_files(
+            ['models/engine/cache.py',
+             'tests/test_models/test_engine/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestObjectCache(unittest.TestCase):
+    """Test the ObjectCache class"""
+    def test_get_put(self):
+        """Test that cached values are returned and counted"""
+        objects = ObjectCache(10)
+        self.assertIsNone(objects.get("State.1"))
+        objects.put("State.1", {"name": "California"})
+        self.assertEqual(objects.get("State.1"), {"name": "California"})
+        stats = objects.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        objects = ObjectCache(2)
+        objects.put("State.1", 1)
+        objects.put("State.2", 2)
+        objects.get("State.1")
+        objects.put("State.3", 3)
+        self.assertIsNone(objects.get("State.2"))
+        self.assertEqual(objects.get("State.1"), 1)
+        self.assertEqual(objects.stats()["evictions"], 1)
+
+    def test_max_bytes(self):
+        """Test that entries are evicted beyond the memory cap"""
+        objects = ObjectCache(100, max_bytes=cache.sizeof("State.1") +
+                              cache.sizeof("x" * 100) + 10)
+        objects.put("State.1", "x" * 100)
+        objects.put("State.2", "x" * 100)
+        self.assertIsNone(objects.get("State.1"))
+        self.assertEqual(objects.stats()["entries"], 1)
+        self.assertLessEqual(objects.stats()["bytes"], objects.max_bytes)
+
+    def test_ttl(self):
+        """Test that entries expire after their time to live"""
+        objects = ObjectCache(10, ttl=5)
+        with mock.patch.object(cache.time, "monotonic", return_value=100):
+            objects.put("State.1", 1)
+        with mock.patch.object(cache.time, "monotonic", return_value=104):
+            self.assertEqual(objects.get("State.1"), 1)
+        with mock.patch.object(cache.time, "monotonic", return_value=106):
+            self.assertIsNone(objects.get("State.1"))
+        self.assertEqual(objects.stats()["expirations"], 1)
+
+    def test_invalidate(self):
+        """Test that invalidated entries are removed"""
+        objects = ObjectCache(10)
+        objects.put("State.1", 1)
+        objects.invalidate("State.1", "State.2")
+        self.assertIsNone(objects.get("State.1"))
+        stats = objects.stats()
+        self.assertEqual((stats["invalidations"], stats["bytes"]), (1, 0))
+
+    def test_put_after_invalidate(self):
+        """Test that a value read before an invalidation is not cached"""
+        objects = ObjectCache(10)
+        version = objects.version()
+        objects.invalidate("State.1")
+        objects.put("State.1", "stale", version)
+        self.assertIsNone(objects.get("State.1"))
+        objects.put("State.2", 2, version)
+        self.assertEqual(objects.get("State.2"), 2)
+        version = objects.version()
+        objects.put("State.1", 1, version)
+        self.assertEqual(objects.get("State.1"), 1)
+        objects.clear()
+        objects.put("State.2", "stale", version)
+        self.assertIsNone(objects.get("State.2"))
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestCodecDocs classes
+"""
+import unittest
+import inspect
+import pep8
+import json
+import os
+import shutil
+import tempfile
+from models.engine import codec
+
+
+class TestCodecDocs(unittest.TestCase):
+    """
+       Tests to check the documentation and style of codec module,
+       its classes and functions.
+    """
+    def test_module_docstring(self):
+        """Test if the codec module has docstring."""
+        self.assertIsNotNone(codec.__doc__, 'codec lacks docstring')
+
+    def test_docstrings(self):
+        """Test if the codec classes and functions have docstrings."""
+        for name, member in inspect.getmembers(codec):
+            if getattr(member, "__module__", None) != codec.__name__:
+                continue
+            with self.subTest(name=name):
+                self.assertIsNotNone(
+                    member.__doc__, '{} lacks a docstring'.format(name))
+
+    def test_pep8_compliance_codec(self):
+        """Test that codec and test_codec conform to PEP 8."""
+        style = pep8.StyleGuide(quiet=True)
+        result = style.check_files(
+            ['models/engine/codec.py',
+             'tests/test_models/test_engine/test_codec.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestCodec(unittest.TestCase):
+    """Test the codecs"""
+    records = {"State.1": {"id": "1", "name": "California",
+                           "created_at": "2017-03-25T02:17:06.000000",
+                           "updated_at": "1969-12-31T23:59:59.999999",
+                           "__class__": "State"}}
+
+    def setUp(self):
+        """Create a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_json_round_trip(self):
+        """Test that the JSON codec reads back what it wrote"""
+        json_codec = codec.get_codec("json")
+        data = json_codec.dumps(self.records)
+        self.assertEqual(json.loads(data), self.records)
+        self.assertEqual(json_codec.loads(data), self.records)
+
+    def test_times_round_trip(self):
+        """Test that datetimes survive the epoch microseconds encoding"""
+        encoded = codec.encode_times(self.records)
+        record = encoded["State.1"]
+        self.assertEqual(record["created_at"], 1490408226000000)
+        self.assertEqual(record["updated_at"], -1)
+        self.assertEqual(self.records["State.1"]["updated_at"],
+                         "1969-12-31T23:59:59.999999")
+        self.assertEqual(codec.decode_times(encoded), self.records)
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs and extensions are rejected"""
+        with self.assertRaises(ValueError):
+            codec.get_codec("xml")
+        with self.assertRaises(ValueError):
+            codec.codec_of("file.xml")
+
+    @unittest.skipIf(codec.msgpack is None, "msgpack is not installed")
+    def test_convert(self):
+        """Test converting a JSON file to MessagePack and back"""
+        source = os.path.join(self.tmp, "file.json")
+        with open(source, "w") as f:
+            json.dump(self.records, f)
+        binary = os.path.join(self.tmp, "file.msgpack")
+        self.assertEqual(codec.convert(source, binary), 1)
+        back = os.path.join(self.tmp, "back.json")
+        codec.convert(binary, back)
+        with open(back) as f:
+            self.assertEqual(json.load(f), self.records)
+
+    @unittest.skipIf(codec.msgpack is not None, "msgpack is installed")
+    def test_msgpack_missing(self):
+        """Test that the msgpack codec needs the msgpack package"""
+        with self.assertRaises(ImportError):
+            codec.get_codec("msgpack")
@@ -19,7 +19,10 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
+import threading
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -109,6 +112,21 @@ class TestDBStorage(unittest.TestCase):
         storage.delete(result)
         storage.save()
 
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_class_name(self):
+        """Test that get accepts class names and misses cleanly"""
+        storage = DBStorage()
+        storage.reload()
+        new_state = State(name="Oregon")
+        storage.new(new_state)
+        storage.save()
+        self.assertIs(storage.get("State", new_state.id), new_state)
+        self.assertIsNone(storage.get(City, new_state.id))
+        self.assertIsNone(storage.get("Nope", new_state.id))
+        self.assertIsNone(storage.get(State, "missing"))
+        storage.delete(new_state)
+        storage.save()
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_count(self):
         """Test that count returns the correct number of objects"""
@@ -135,3 +153,285 @@ class TestDBStorage(unittest.TestCase):
         # Test count after deleting the new state
         self.assertEqual(storage.count(), initial_count)
         self.assertEqual(storage.count(State), initial_state_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts returns the count of each class"""
+        storage = DBStorage()
+        storage.reload()
+        initial = storage.counts()
+        self.assertEqual(set(initial), set(classes))
+        new_state = State(name="Utah")
+        storage.new(new_state)
+        storage.save()
+        counts = storage.counts([State, "City"])
+        self.assertEqual(counts, {"State": initial["State"] + 1,
+                                  "City": initial["City"]})
+        self.assertEqual(storage.count(), sum(initial.values()) + 1)
+        storage.delete(new_state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """Test that search_places combines states, cities and amenities"""
+        storage = DBStorage()
+        storage.reload()
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        wifi = Amenity(name="Wifi")
+        oven = Amenity(name="Oven")
+        place1 = Place(city_id=city.id, user_id=user.id, name="One")
+        place2 = Place(city_id=city.id, user_id=user.id, name="Two")
+        place1.amenities.extend([wifi, oven])
+        place2.amenities.append(wifi)
+        objs = [user, state, city, wifi, oven, place1, place2]
+        for obj in objs:
+            storage.new(obj)
+        storage.save()
+        self.assertCountEqual(storage.search_places([state.id]),
+                              [place1, place2])
+        self.assertCountEqual(storage.search_places([], [city.id],
+                                                    [wifi.id]),
+                              [place1, place2])
+        self.assertEqual(storage.search_places([state.id], [],
+                                               [wifi.id, oven.id]),
+                         [place1])
+        self.assertEqual(storage.search_places(["missing"]), [])
+        for obj in reversed(objs):
+            storage.delete(obj)
+            storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that page walks a class in (created_at, id) order"""
+        storage = DBStorage()
+        storage.reload()
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        cursor = (states[0].created_at, states[0].id)
+        self.assertEqual(storage.page(State, 2, cursor), states[1:])
+        self.assertEqual(len(storage.page("State", 1)), 1)
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iter(self):
+        """Test that iter yields every object of a class"""
+        storage = DBStorage()
+        storage.reload()
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        ids = [state.id for state in storage.iter("State", 2)]
+        self.assertEqual(len(ids), storage.count(State))
+        for state in states:
+            self.assertIn(state.id, ids)
+            storage.delete(state)
+        storage.save()
+
+    def test_pool_options(self):
+        """Test that the pool arguments follow HBNB_MYSQL_POOL_*"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "20", "HBNB_MYSQL_POOL_RECYCLE": "60",
+               "HBNB_MYSQL_POOL_PRE_PING": "0"}
+        with mock.patch.dict(os.environ, env):
+            options = db_storage.pool_options("mysql+mysqldb://u:p@h/db")
+            self.assertEqual(options["pool_size"], 20)
+            self.assertEqual(options["pool_recycle"], 60)
+            self.assertFalse(options["pool_pre_ping"])
+            self.assertEqual(options["max_overflow"], 10)
+            options = db_storage.pool_options("sqlite:////tmp/hbnb.db")
+            self.assertIn("poolclass", options)
+            options = db_storage.pool_options("sqlite://")
+            self.assertIs(options["poolclass"], db_storage.StaticPool)
+            self.assertNotIn("pool_size", options)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_memory_database(self):
+        """Test that the threads share one in-memory SQLite database"""
+        with mock.patch.dict(os.environ, {"HBNB_DB_URL": "sqlite://"}):
+            storage = DBStorage()
+        storage.reload()
+        storage.new(State(name="California"))
+        storage.save()
+        counts = []
+        thread = threading.Thread(
+            target=lambda: counts.append(storage.count(State)))
+        thread.start()
+        thread.join()
+        self.assertEqual(counts, [1])
+        stats = storage.pool_stats()
+        self.assertGreater(stats["checkouts"], 0)
+        self.assertIsNone(stats["size"])
+        storage.close()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats counts the connection checkouts"""
+        storage = DBStorage()
+        storage.reload()
+        checkouts = storage.pool_stats()["checkouts"]
+        storage.count(State)
+        storage.close()
+        stats = storage.pool_stats()
+        self.assertEqual(stats["checkouts"], checkouts + 1)
+        self.assertEqual(stats["checkins"], stats["checkouts"])
+        self.assertIn(stats["checkedout"], (0, None))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_wait(self):
+        """Test that pool_stats times the checkouts waiting for a
+        connection"""
+        url = os.environ.get("HBNB_DB_URL", "")
+        if "pool_size" not in db_storage.pool_options(url):
+            self.skipTest("in-memory databases share a single connection")
+        with mock.patch.dict(os.environ, {"HBNB_MYSQL_POOL_SIZE": "1",
+                                          "HBNB_MYSQL_POOL_OVERFLOW": "0"}):
+            storage = DBStorage()
+        storage.reload()
+        held = storage._DBStorage__engine.connect()
+        release = threading.Timer(0.2, held.close)
+        release.start()
+        storage.count(State)
+        storage.close()
+        release.join()
+        stats = storage.pool_stats()
+        self.assertGreaterEqual(stats["wait_ms_max"], 150)
+        self.assertGreaterEqual(stats["wait_ms_total"], stats["wait_ms_max"])
+        self.assertGreater(stats["wait_ms_avg"], 0)
+
+    def test_sqlite_pragmas(self):
+        """Test that SQLite files get WAL and the HBNB_SQLITE_* settings"""
+        with mock.patch.dict(os.environ, {"HBNB_SQLITE_SYNCHRONOUS": "FULL"}):
+            pragmas = db_storage.sqlite_pragmas("sqlite:////tmp/hbnb.db")
+        self.assertIn("PRAGMA journal_mode=WAL", pragmas)
+        self.assertIn("PRAGMA synchronous=FULL", pragmas)
+        self.assertIn("PRAGMA foreign_keys=ON", pragmas)
+        pragmas = db_storage.sqlite_pragmas("sqlite://")
+        self.assertNotIn("PRAGMA journal_mode=WAL", pragmas)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_sqlite_connection(self):
+        """Test that the pragmas are applied to SQLite connections"""
+        storage = DBStorage()
+        engine = storage._DBStorage__engine
+        if engine.dialect.name != "sqlite":
+            self.skipTest("not an SQLite database")
+        with engine.connect() as connection:
+            foreign_keys = connection.exec_driver_sql(
+                "PRAGMA foreign_keys").scalar()
+        self.assertEqual(foreign_keys, 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_missing_indexes_created(self):
+        """Test that reload creates the indexes missing from old tables"""
+        storage = DBStorage()
+        storage.reload()
+        engine = storage._DBStorage__engine
+        index = next(index for index in City.__table__.indexes
+                     if index.name == "ix_cities_state_id")
+        index.drop(engine)
+        storage.reload()
+        names = [index["name"] for index in
+                 sqlalchemy.inspect(engine).get_indexes("cities")]
+        self.assertIn("ix_cities_state_id", names)
+        names = [index["name"] for index in
+                 sqlalchemy.inspect(engine).get_indexes("place_amenity")]
+        self.assertIn("ix_place_amenity_amenity_id_place_id", names)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_new_update(self):
+        """Test that bulk_new adds and bulk_update updates many objects"""
+        storage = DBStorage()
+        storage.reload()
+        count = storage.count(State)
+        states = [State(name=str(i)) for i in range(3)]
+        storage.bulk_new(states)
+        storage.save()
+        self.assertEqual(storage.count(State), count + 3)
+        updated = storage.bulk_update("State", [
+            {"id": states[0].id, "name": "California"},
+            {"id": "missing", "name": "Nevada"}])
+        storage.save()
+        self.assertEqual(list(updated), [states[0].id])
+        self.assertEqual(storage.get(State, states[0].id).name, "California")
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_object_cache(self):
+        """Test that get serves cached objects until they change"""
+        with mock.patch.dict(os.environ, {"HBNB_DB_CACHE_SIZE": "100"}):
+            storage = DBStorage()
+        storage.reload()
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            """Record one statement"""
+            statements.append(statement)
+        state = State(name="California")
+        storage.new(state)
+        storage.new(City(name="Fremont", state_id=state.id))
+        storage.save()
+        storage.close()
+        storage.get(State, state.id, load=["cities"])
+        storage.close()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            cached = storage.get(State, state.id, load=["cities"])
+            self.assertEqual([city.name for city in cached.cities],
+                             ["Fremont"])
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(statements, [])
+        storage.new(City(name="Reno", state_id=state.id))
+        cached.name = "Nevada"
+        storage.save()
+        storage.close()
+        state = storage.get(State, state.id, load=["cities"])
+        self.assertEqual(state.name, "Nevada")
+        self.assertEqual(sorted(city.name for city in state.cities),
+                         ["Fremont", "Reno"])
+        stats = storage.cache_stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["invalidations"], 0)
+        for city in state.cities:
+            storage.delete(city)
+        storage.delete(state)
+        storage.save()
+        storage.close()
+        self.assertIsNone(storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_object_cache_race(self):
+        """Test that get does not cache a row changed while it was read"""
+        with mock.patch.dict(os.environ, {"HBNB_DB_CACHE_SIZE": "100"}):
+            storage = DBStorage()
+        storage.reload()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        cache = storage._DBStorage__cache
+        version = cache.version
+
+        def racing():
+            """Return the version, then let another writer commit"""
+            taken = version()
+            cache.invalidate("State." + state.id)
+            return taken
+        with mock.patch.object(cache, "version", racing):
+            storage.get(State, state.id)
+        self.assertIsNone(cache.get("State." + state.id))
+        storage.close()
+        storage.get(State, state.id)
+        self.assertIsNotNone(cache.get("State." + state.id))
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+        storage.close()
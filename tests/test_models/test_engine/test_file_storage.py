@@ -7,7 +7,16 @@ import inspect
 import pep8
 import json
 import models
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import mock
 from models.engine import file_storage
+from models.engine.journal import Journal
+from models.engine.lock import StoreLock
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -183,3 +192,841 @@ class TestFileStorage(unittest.TestCase):
 
         # Restore the original state of __objects
         FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_unchanged_file(self):
+        """Test that reload keeps the objects when file.json is unchanged"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage.reload()
+        key = "State." + state.id
+        self.assertIs(storage.all()[key], state)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_changed_records(self):
+        """Test that reload only rebuilds the records that changed"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        storage.new(state1)
+        storage.new(state2)
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + state1.id]["name"] = "Arizona"
+        del js["State." + state2.id]
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        storage.reload()
+        new_dict = storage.all()
+        self.assertEqual(new_dict["State." + state1.id].name, "Arizona")
+        self.assertIsNot(new_dict["State." + state1.id], state1)
+        self.assertNotIn("State." + state2.id, new_dict)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_keeps_password(self):
+        """Test that a user's password hash survives save and reload"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        user = User(email="a@b.c", password="pwd")
+        with mock.patch.object(FileStorage, "_FileStorage__mode", "json"):
+            storage.new(user)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__records = {}
+            FileStorage._FileStorage__signature = None
+            storage.reload()
+        reloaded = storage.all()["User." + user.id]
+        self.assertIsNot(reloaded, user)
+        self.assertEqual(reloaded.password, user.password)
+        self.assertNotIn("password", reloaded.to_dict())
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_class_index(self):
+        """Test that all, get and count follow new and delete"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertIs(storage.get("State", state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        self.assertEqual(storage.count("State"), 1)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertEqual(storage.count(State), 0)
+        self.assertEqual(storage.count(), 1)
+        storage.all().pop("City." + city.id)
+        self.assertEqual(storage.count(City), 0)
+        self.assertIsNone(storage.get(City, city.id))
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_counts(self):
+        """Test that counts returns the count of each class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        for cls in [State, State, City]:
+            storage.new(cls())
+        self.assertEqual(storage.counts([State, "City", "User"]),
+                         {"State": 2, "City": 1, "User": 0})
+        self.assertEqual(sum(storage.counts().values()), 3)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_generation(self):
+        """Test that generation changes with the objects of its class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        city_generation = storage.generation(City)
+        generation = storage.generation(State)
+        storage.new(state)
+        self.assertNotEqual(storage.generation("State"), generation)
+        generation = storage.generation(State)
+        storage.delete(state)
+        self.assertNotEqual(storage.generation(State), generation)
+        self.assertEqual(storage.generation(City), city_generation)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_generation_read_only(self):
+        """Test that reading objects leaves generation unchanged"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = dict(save)
+        generation = storage.generation(State)
+        storage.all(State)
+        storage.all()
+        self.assertEqual(storage.generation(State), generation)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_children(self):
+        """Test that children follows new, delete and foreign key updates"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        city1 = City(name="Fremont", state_id=state1.id)
+        city2 = City(name="Reno", state_id=state2.id)
+        place = Place(name="Home", city_id=city1.id)
+        for obj in [state1, state2, city1, city2, place]:
+            storage.new(obj)
+        self.assertEqual(storage.children(State, state1.id, City), [city1])
+        self.assertEqual(state2.cities, [city2])
+        self.assertEqual(city1.places, [place])
+        self.assertEqual(storage.children("State", state1.id, "Place"), [])
+        city2.state_id = state1.id
+        self.assertEqual(state2.cities, [])
+        self.assertCountEqual(state1.cities, [city1, city2])
+        place.city_id = city2.id
+        self.assertEqual(city2.places, [place])
+        storage.save()
+        self.assertCountEqual(state1.cities, [city1, city2])
+        storage.delete(city1)
+        self.assertEqual(state1.cities, [city2])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_search_places(self):
+        """Test that search_places combines states, cities and amenities"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        city1 = City(name="Fremont", state_id=state.id)
+        city2 = City(name="Reno", state_id="Nevada")
+        wifi = Amenity(name="Wifi")
+        oven = Amenity(name="Oven")
+        place1 = Place(city_id=city1.id, amenity_ids=[wifi.id, oven.id])
+        place2 = Place(city_id=city1.id, amenity_ids=[wifi.id])
+        place3 = Place(city_id=city2.id, amenity_ids=[oven.id])
+        for obj in [state, city1, city2, wifi, oven, place1, place2, place3]:
+            storage.new(obj)
+        self.assertCountEqual(storage.search_places(),
+                              [place1, place2, place3])
+        self.assertCountEqual(storage.search_places([state.id]),
+                              [place1, place2])
+        self.assertCountEqual(storage.search_places([state.id], [city2.id]),
+                              [place1, place2, place3])
+        self.assertCountEqual(storage.search_places(amenity_ids=[oven.id]),
+                              [place1, place3])
+        self.assertEqual(storage.search_places([state.id], [],
+                                               [wifi.id, oven.id]),
+                         [place1])
+        self.assertEqual(storage.search_places(["missing"]), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_page(self):
+        """Test that page walks a class in (created_at, id) order"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State(name=str(i)) for i in range(5)]
+        for state in reversed(states):
+            storage.new(state)
+        storage.new(City())
+        self.assertEqual(storage.page(State), states)
+        self.assertEqual(storage.page(State, 2), states[:2])
+        cursor = (states[1].created_at, states[1].id)
+        self.assertEqual(storage.page("State", 2, cursor), states[2:4])
+        storage.delete(states[2])
+        self.assertEqual(storage.page(State, None, cursor), states[3:])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_iter(self):
+        """Test that iter yields the objects of a class in batches"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State() for i in range(5)]
+        for obj in states + [City()]:
+            storage.new(obj)
+        self.assertEqual(list(storage.iter(State, 2)), states)
+        self.assertEqual(len(list(storage.iter())), 6)
+        objs = storage.iter("State", 2)
+        next(objs)
+        storage.delete(states[3])
+        self.assertEqual(list(objs), states[1:3] + states[4:])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_bulk_new_update(self):
+        """Test that bulk_new adds and bulk_update updates many objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State(name=str(i)) for i in range(3)]
+        storage.bulk_new(states)
+        self.assertEqual(storage.count(State), 3)
+        updated_at = states[0].updated_at
+        updated = storage.bulk_update(State, [
+            {"id": states[0].id, "name": "California", "created_at": 0},
+            {"id": "missing", "name": "Nevada"}])
+        self.assertEqual(updated, {states[0].id: states[0]})
+        self.assertEqual(states[0].name, "California")
+        self.assertNotEqual(states[0].created_at, 0)
+        self.assertNotEqual(states[0].updated_at, updated_at)
+        FileStorage._FileStorage__objects = save
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    def setUp(self):
+        """Switch FileStorage to journal mode on a scratch file"""
+        self.tmp = tempfile.mkdtemp()
+        self.saved = {}
+        for attr in ["file_path", "objects", "records", "signature",
+                     "mode", "compact_every", "generation"]:
+            name = "_FileStorage__" + attr
+            self.saved[name] = getattr(FileStorage, name)
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__mode = "journal"
+        FileStorage._FileStorage__compact_every = 1000
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        shutil.rmtree(self.tmp)
+
+    def journal_lines(self):
+        """Return the records currently in the journal"""
+        with open(os.path.join(self.tmp, "file.json.journal")) as f:
+            return [json.loads(line) for line in f]
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_appends_changes(self):
+        """Test that save only journals the objects that changed"""
+        storage = FileStorage()
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        storage.new(state1)
+        storage.new(state2)
+        storage.save()
+        self.assertEqual(len(self.journal_lines()), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "file.json")))
+        state1.name = "Arizona"
+        storage.delete(state2)
+        storage.save()
+        lines = self.journal_lines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[2]["op"], "put")
+        self.assertEqual(lines[2]["value"]["name"], "Arizona")
+        self.assertEqual(lines[3], {"op": "del",
+                                    "key": "State." + state2.id})
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_updates_records_in_place(self):
+        """Test that save updates the stored records without copying
+        them, and only once the changes are journaled"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        records = FileStorage._FileStorage__records
+        state.name = "Nevada"
+        with mock.patch.object(Journal, "append", side_effect=OSError):
+            self.assertRaises(OSError, storage.save)
+        self.assertEqual(records["State." + state.id]["name"], "California")
+        storage.save()
+        self.assertIs(FileStorage._FileStorage__records, records)
+        self.assertEqual(records["State." + state.id]["name"], "Nevada")
+        self.assertEqual(self.journal_lines()[-1]["value"]["name"],
+                         "Nevada")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_replays_journal(self):
+        """Test that reload replays the journal on top of the snapshot"""
+        storage = FileStorage()
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        storage.new(state1)
+        storage.new(state2)
+        storage.save()
+        state1.name = "Arizona"
+        storage.delete(state2)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__signature = None
+        storage.reload()
+        self.assertEqual(list(storage.all().keys()), ["State." + state1.id])
+        self.assertEqual(storage.all()["State." + state1.id].name, "Arizona")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_compaction(self):
+        """Test that a long journal is compacted into the snapshot"""
+        FileStorage._FileStorage__compact_every = 3
+        storage = FileStorage()
+        for name in ["California", "Nevada", "Arizona"]:
+            storage.new(State(name=name))
+            storage.save()
+        self.assertEqual(self.journal_lines(), [])
+        with open(os.path.join(self.tmp, "file.json")) as f:
+            js = json.load(f)
+        self.assertEqual(js.keys(), storage.all().keys())
+
+
+class TestFileStorageSharded(unittest.TestCase):
+    """Test the sharded mode of the FileStorage class"""
+    def setUp(self):
+        """Switch FileStorage to sharded mode on a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.saved = {}
+        for attr in ["file_path", "objects", "records", "mode", "buckets",
+                     "shards", "loaded", "generation"]:
+            name = "_FileStorage__" + attr
+            self.saved[name] = getattr(FileStorage, name)
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp,
+                                                           "file.json")
+        FileStorage._FileStorage__mode = "sharded"
+        FileStorage._FileStorage__buckets = 1
+        self.restart()
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        shutil.rmtree(self.tmp)
+
+    def restart(self):
+        """Forget the objects in memory, like a new process would"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__shards = {}
+        FileStorage._FileStorage__loaded = set()
+
+    def shard(self, name):
+        """Return the path of a shard file"""
+        return os.path.join(self.tmp, "file.d", name)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_writes_changed_shards(self):
+        """Test that save only rewrites the shards of changed classes"""
+        storage = FileStorage()
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        with open(self.shard("State.json")) as f:
+            self.assertEqual(list(json.load(f)), ["State." + state.id])
+        before = os.stat(self.shard("State.json"))
+        city.name = "Napa"
+        storage.save()
+        after = os.stat(self.shard("State.json"))
+        self.assertEqual(before.st_mtime_ns, after.st_mtime_ns)
+        with open(self.shard("City.json")) as f:
+            self.assertEqual(json.load(f)["City." + city.id]["name"], "Napa")
+        storage.delete(city)
+        storage.save()
+        with open(self.shard("City.json")) as f:
+            self.assertEqual(json.load(f), {})
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_lazy_load(self):
+        """Test that a class is only read when it is first used"""
+        storage = FileStorage()
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        self.restart()
+        storage.reload()
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(list(storage.all(State)), ["State." + state.id])
+        self.assertEqual(FileStorage._FileStorage__loaded, {"State"})
+        self.assertNotIn("City." + city.id,
+                         FileStorage._FileStorage__objects)
+        self.assertEqual(storage.get(City, city.id).name, "Fresno")
+        self.assertEqual(storage.count(), 2)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_new_keeps_unloaded_objects(self):
+        """Test that saving a new object keeps the stored ones"""
+        storage = FileStorage()
+        state1 = State(name="California")
+        storage.new(state1)
+        storage.save()
+        self.restart()
+        state2 = State(name="Nevada")
+        storage.new(state2)
+        storage.save()
+        with open(self.shard("State.json")) as f:
+            self.assertEqual(set(json.load(f)), {"State." + state1.id,
+                                                 "State." + state2.id})
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_changed_shard(self):
+        """Test that reload picks up the changes of another process"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        with open(self.shard("State.json")) as f:
+            records = json.load(f)
+        records["State." + state.id]["name"] = "Nevada"
+        with open(self.shard("State.json"), "w") as f:
+            json.dump(records, f)
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Nevada")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_buckets(self):
+        """Test that the objects of a class are spread over buckets"""
+        FileStorage._FileStorage__buckets = 4
+        storage = FileStorage()
+        ids = set()
+        for i in range(20):
+            state = State(name=str(i))
+            storage.new(state)
+            ids.add(state.id)
+        storage.save()
+        stored = set()
+        for bucket in range(4):
+            with open(self.shard("State.{}.json".format(bucket))) as f:
+                stored.update(json.load(f))
+        self.assertEqual(stored, {"State." + i for i in ids})
+        self.restart()
+        self.assertEqual({obj.id for obj in storage.all(State).values()},
+                         ids)
+
+
+class TestFileStorageDirty(unittest.TestCase):
+    """Test that FileStorage.save only serializes changed objects"""
+    def setUp(self):
+        """Point FileStorage to a scratch file"""
+        self.tmp = tempfile.mkdtemp()
+        self.saved = {}
+        for attr in ["file_path", "objects", "records", "signature",
+                     "mode", "generation"]:
+            name = "_FileStorage__" + attr
+            self.saved[name] = getattr(FileStorage, name)
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__mode = "json"
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        shutil.rmtree(self.tmp)
+
+    def stored(self):
+        """Return the records in the scratch file"""
+        with open(os.path.join(self.tmp, "file.json")) as f:
+            return json.load(f)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_serializes_dirty_objects(self):
+        """Test that save only calls to_dict on changed objects"""
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        states[2].name = "Nevada"
+        to_dict = State.to_dict
+        with mock.patch.object(State, "to_dict", autospec=True,
+                               side_effect=to_dict) as m:
+            storage.save()
+        self.assertEqual([call[0][0] for call in m.call_args_list],
+                         [states[2]])
+        self.assertEqual(self.stored()["State." + states[2].id]["name"],
+                         "Nevada")
+        self.assertEqual(len(self.stored()), 5)
+        with mock.patch.object(State, "to_dict", autospec=True,
+                               side_effect=to_dict) as m:
+            storage.save()
+        self.assertFalse(m.called)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_deleted_and_relinked(self):
+        """Test that deletions and foreign key changes are saved"""
+        storage = FileStorage()
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        city = City(name="Reno", state_id=state1.id)
+        for obj in [state1, state2, city]:
+            storage.new(obj)
+        storage.save()
+        city.state_id = state2.id
+        storage.delete(state1)
+        storage.save()
+        self.assertNotIn("State." + state1.id, self.stored())
+        self.assertEqual(storage.children(State, state2.id, City), [city])
+        self.assertEqual(storage.children(State, state1.id, City), [])
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_while_other_threads_assign(self):
+        """Test that save runs while other threads build and edit objects"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        stop = threading.Event()
+        errors = []
+
+        def build():
+            """Build and edit objects, kept alive, until stopped"""
+            built = []
+            try:
+                while not stop.is_set():
+                    built.append(State(name="Nevada"))
+                    built[-1].name = "Utah"
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=build) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        try:
+            for i in range(200):
+                state.name = str(i)
+                storage.save()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.stored()["State." + state.id]["name"], "199")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_after_failed_write(self):
+        """Test that changes a failed save did not write are saved next"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        state.name = "Nevada"
+        with mock.patch.object(os, "replace", side_effect=OSError):
+            self.assertRaises(OSError, storage.save)
+        storage.save()
+        self.assertEqual(self.stored()["State." + state.id]["name"],
+                         "Nevada")
+
+
+class TestFileStorageMapped(unittest.TestCase):
+    """Test the mapped mode of the FileStorage class"""
+    def setUp(self):
+        """Switch FileStorage to mapped mode on a scratch file"""
+        self.tmp = tempfile.mkdtemp()
+        self.saved = {}
+        for attr in ["file_path", "objects", "records", "signature",
+                     "mode", "loaded", "mapped", "generation"]:
+            name = "_FileStorage__" + attr
+            self.saved[name] = getattr(FileStorage, name)
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp,
+                                                           "file.json")
+        FileStorage._FileStorage__mode = "mapped"
+        self.restart()
+        storage = FileStorage()
+        self.states = [State(name=str(i)) for i in range(3)]
+        self.city = City(name="Reno", state_id=self.states[0].id)
+        for obj in self.states + [self.city]:
+            storage.new(obj)
+        storage.save()
+        self.restart()
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        if FileStorage._FileStorage__mapped is not None:
+            FileStorage._FileStorage__mapped.close()
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        shutil.rmtree(self.tmp)
+
+    def restart(self):
+        """Forget the objects in memory, like a new process would"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__loaded = set()
+        FileStorage._FileStorage__mapped = None
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_decodes_nothing(self):
+        """Test that reload only maps the snapshot"""
+        storage = FileStorage()
+        storage.reload()
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp, "file.map")))
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_get_decodes_one_object(self):
+        """Test that get only builds the object it returns"""
+        storage = FileStorage()
+        storage.reload()
+        state = storage.get(State, self.states[1].id)
+        self.assertEqual(state.name, "1")
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["State." + state.id])
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIsNone(storage.get(State, "missing"))
+        self.assertEqual(len(storage.all(State)), 3)
+        self.assertIs(storage.all(State)["State." + state.id], state)
+        self.assertEqual(storage.count(), 4)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_get_count_decode_nothing_again(self):
+        """Test that repeated gets and counts decode no records"""
+        storage = FileStorage()
+        storage.reload()
+        state = storage.get(State, self.states[1].id)
+        mapped = FileStorage._FileStorage__mapped
+        with mock.patch.object(mapped, "get", wraps=mapped.get) as m:
+            for i in range(5):
+                self.assertIs(storage.get(State, state.id), state)
+            self.assertEqual(storage.count(State), 3)
+            self.assertEqual(storage.counts([State, "City", "Place"]),
+                             {"State": 3, "City": 1, "Place": 0})
+            storage.delete(state)
+            storage.new(State(name="Utah"))
+            self.assertEqual(storage.count(State), 3)
+            self.assertEqual(storage.count(), 4)
+        self.assertFalse(m.called)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_keeps_undecoded_objects(self):
+        """Test that save keeps the records it did not decode"""
+        storage = FileStorage()
+        storage.reload()
+        storage.get(State, self.states[0].id).name = "Nevada"
+        storage.delete(storage.get(City, self.city.id))
+        storage.new(State(name="Utah"))
+        storage.save()
+        self.restart()
+        storage.reload()
+        names = sorted(state.name for state in storage.all(State).values())
+        self.assertEqual(names, ["1", "2", "Nevada", "Utah"])
+        self.assertIsNone(storage.get(City, self.city.id))
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_changed_snapshot(self):
+        """Test that reload updates the objects already decoded"""
+        storage = FileStorage()
+        storage.reload()
+        state = storage.get(State, self.states[0].id)
+        mapped = FileStorage._FileStorage__mapped
+        record = dict(mapped.get("State." + state.id), name="Nevada")
+        mapped.write({"State." + state.id: record,
+                      "City." + self.city.id: None})
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Nevada")
+        self.assertIsNone(storage.get(City, self.city.id))
+
+
+class TestFileStorageLocking(unittest.TestCase):
+    """Test the atomic writes and the locking of the FileStorage class"""
+    def setUp(self):
+        """Point FileStorage to a scratch file"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = {}
+        for attr in ["file_path", "objects", "records", "signature",
+                     "mode", "generation"]:
+            name = "_FileStorage__" + attr
+            self.saved[name] = getattr(FileStorage, name)
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__mode = "json"
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, name, value)
+        shutil.rmtree(self.tmp)
+
+    def stored(self):
+        """Return the records in the scratch file"""
+        with open(self.path) as f:
+            return json.load(f)
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_failed_write_keeps_file(self):
+        """Test that a failing save leaves the stored file whole"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        state.name = "Nevada"
+        codec = FileStorage._FileStorage__codec
+        with mock.patch.object(codec, "dumps", side_effect=OSError):
+            with self.assertRaises(OSError):
+                storage.save()
+        self.assertEqual(self.stored()["State." + state.id]["name"],
+                         "California")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_missing_directory(self):
+        """Test that a store in a missing directory reloads as empty"""
+        FileStorage._FileStorage__file_path = os.path.join(
+            self.tmp, "missing", "file.json")
+        storage = FileStorage()
+        storage.reload()
+        self.assertEqual(storage.all(), {})
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_reload_same_signature_commit(self):
+        """Test that reload reads a commit leaving the same signature"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        st = os.stat(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "r+b") as f:
+            f.write(data.replace(b"California", b"Nevadaaaaa"))
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        StoreLock(self.path + ".lock").bump()
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Nevadaaaaa")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_save_merges_other_commits(self):
+        """Test that save keeps the changes committed by another process"""
+        storage = FileStorage()
+        state1 = State(name="California")
+        state2 = State(name="Nevada")
+        storage.new(state1)
+        storage.new(state2)
+        storage.save()
+        records = self.stored()
+        records["State." + state2.id]["name"] = "Utah"
+        state3 = State(name="Texas")
+        records["State." + state3.id] = state3.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        StoreLock(self.path + ".lock").bump()
+        state1.name = "Arizona"
+        storage.save()
+        records = self.stored()
+        self.assertEqual(records["State." + state1.id]["name"], "Arizona")
+        self.assertEqual(records["State." + state2.id]["name"], "Utah")
+        self.assertIn("State." + state3.id, records)
+        self.assertIs(storage.get(State, state1.id), state1)
+        self.assertEqual(storage.get(State, state2.id).name, "Utah")
+
+    @unittest.skipIf(models.storage_t == 'db',
+                     "Skipping because database storage is used")
+    def test_concurrent_processes(self):
+        """Test that processes saving at the same time lose no object"""
+        code = ("from models.state import State\n"
+                "for i in range(10):\n"
+                "    State(name=str(i)).save()\n")
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        env = dict(os.environ, PYTHONPATH=root, HBNB_FILE_MODE="json")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        processes = [subprocess.Popen([sys.executable, "-c", code],
+                                      cwd=self.tmp, env=env)
+                     for i in range(4)]
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+        self.assertEqual(len(self.stored()), 40)
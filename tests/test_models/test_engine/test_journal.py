@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs classes
+"""
+import unittest
+import inspect
+import pep8
+import os
+import shutil
+import tempfile
+from models.engine import journal
+Journal = journal.Journal
+
+
+class TestJournalDocs(unittest.TestCase):
+    """
+       Tests to check the documentation and style of journal module,
+       the Journal class and its methods.
+    """
+    def test_module_docstring(self):
+        """Test if the journal module has docstring."""
+        self.assertIsNotNone(journal.__doc__,
+                             'journal lacks docstring')
+
+    def test_class_docstring(self):
+        """Test if the Journal class has docstring."""
+        self.assertIsNotNone(Journal.__doc__,
+                             'Journal lacks docstring')
+
+    def test_method_docstrings(self):
+        """Test if all methods in Journal class have docstrings."""
+        for name, method in inspect.getmembers(Journal,
+                                               predicate=inspect.isfunction):
+            self.assertIsNotNone(
+                method.__doc__, '{} method lacks a docstring'.format(name))
+
+    def test_pep8_compliance_journal(self):
+        """Test that journal and test_journal conform to PEP 8."""
+        style = pep8.StyleGuide(quiet=True)
+        result = style.check_files(
+            ['models/engine/journal.py',
+             'tests/test_models/test_engine/test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         ("Found code style errors (and warnings). "
+                          "Total errors: {}".format(result.total_errors)))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Create a journal in a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.journal = Journal(os.path.join(self.tmp, "file.json.journal"))
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_empty(self):
+        """Test that a missing journal replays nothing"""
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(len(self.journal), 0)
+
+    def test_append_replay(self):
+        """Test that appended changes are replayed in order"""
+        self.journal.append([("State.1", {"name": "California"}),
+                             ("State.2", {"name": "Nevada"})])
+        self.journal.append([("State.1", None)])
+        self.assertEqual(len(self.journal), 3)
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"name": "California"}),
+                          ("State.2", {"name": "Nevada"}),
+                          ("State.1", None)])
+        records = {"State.3": {"name": "Texas"}}
+        self.assertEqual(self.journal.apply(records),
+                         {"State.2": {"name": "Nevada"},
+                          "State.3": {"name": "Texas"}})
+
+    def test_torn_record(self):
+        """Test that replay stops at an incomplete last record"""
+        self.journal.append([("State.1", {"name": "California"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('{"op": "put", "key": "State.2", "val')
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"name": "California"})])
+
+    def test_torn_record_then_append(self):
+        """Test that an append after a torn record is replayed"""
+        self.journal.append([("State.1", {"name": "California"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('{"op": "put", "key": "State.2", "val')
+        self.journal.append([("State.3", {"name": "Nevada"})])
+        self.assertEqual(list(Journal(self.journal.path).replay()),
+                         [("State.1", {"name": "California"}),
+                          ("State.3", {"name": "Nevada"})])
+
+    def test_unterminated_record(self):
+        """Test that a last record without its newline is not replayed"""
+        self.journal.append([("State.1", {"name": "California"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('{"op": "del", "key": "State.1"}')
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"name": "California"})])
+        self.journal.append([("State.2", {"name": "Nevada"})])
+        self.assertEqual(len(list(self.journal.replay())), 2)
+
+    def test_truncate(self):
+        """Test that truncate empties the journal"""
+        self.journal.append([("State.1", {"name": "California"})])
+        self.journal.truncate()
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(len(self.journal), 0)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Contains the TestStoreLockDocs classes
+"""
+import unittest
+import inspect
+import pep8
+import os
+import shutil
+import tempfile
+from models.engine import lock
+StoreLock = lock.StoreLock
+
+
+class TestStoreLockDocs(unittest.TestCase):
+    """
+       Tests to check the documentation and style of lock module,
+       the StoreLock class and its methods.
+    """
+    def test_module_docstring(self):
+        """Test if the lock module has docstring."""
+        self.assertIsNotNone(lock.__doc__, 'lock lacks docstring')
+
+    def test_class_docstring(self):
+        """Test if the StoreLock class has docstring."""
+        self.assertIsNotNone(StoreLock.__doc__, 'StoreLock lacks docstring')
+
+    def test_method_docstrings(self):
+        """Test if all methods in StoreLock class have docstrings."""
+        for name, method in inspect.getmembers(StoreLock,
+                                               predicate=inspect.isfunction):
+            self.assertIsNotNone(
+                method.__doc__, '{} method lacks a docstring'.format(name))
+
+    def test_pep8_compliance_lock(self):
+        """Test that lock and test_lock conform to PEP 8."""
+        style = pep8.StyleGuide(quiet=True)
+        result = style.check_files(
+            ['models/engine/lock.py',
+             'tests/test_models/test_engine/test_lock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestStoreLock(unittest.TestCase):
+    """Test the StoreLock class"""
+    def setUp(self):
+        """Create a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json.lock")
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_generation(self):
+        """Test that the generation starts at 0 and is bumped by one"""
+        store_lock = StoreLock(self.path)
+        self.assertEqual(store_lock.generation(), 0)
+        with store_lock.exclusive():
+            self.assertEqual(store_lock.bump(), 1)
+            self.assertEqual(store_lock.bump(), 2)
+        self.assertEqual(StoreLock(self.path).generation(), 2)
+
+    def test_missing_directory(self):
+        """Test that a lock file that cannot be created locks nothing"""
+        store_lock = StoreLock(os.path.join(self.tmp, "missing", "f.lock"))
+        with store_lock.exclusive():
+            self.assertIsNone(store_lock.generation())
+            self.assertIsNone(store_lock.bump())
+        with store_lock.shared():
+            pass
+
+    def test_nested_holds(self):
+        """Test that a thread can hold the lock again while holding it"""
+        store_lock = StoreLock(self.path)
+        with store_lock.exclusive():
+            with store_lock.shared():
+                store_lock.bump()
+        self.assertEqual(store_lock.generation(), 1)
+
+    @unittest.skipIf(lock.fcntl is None, "fcntl is not available")
+    def test_exclusive_excludes_other_descriptors(self):
+        """Test that an exclusive hold blocks the other lock holders"""
+        store_lock = StoreLock(self.path)
+        with store_lock.exclusive():
+            fd = os.open(self.path, os.O_RDWR)
+            try:
+                with self.assertRaises(BlockingIOError):
+                    lock.fcntl.flock(fd, lock.fcntl.LOCK_SH |
+                                     lock.fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the TestMappedSnapshotDocs classes
+"""
+import unittest
+import inspect
+import pep8
+import os
+import shutil
+import tempfile
+from models.engine import mapped
+from models.engine.codec import get_codec
+MappedSnapshot = mapped.MappedSnapshot
+
+
+class TestMappedSnapshotDocs(unittest.TestCase):
+    """
+       Tests to check the documentation and style of mapped module,
+       the MappedSnapshot class and its methods.
+    """
+    def test_module_docstring(self):
+        """Test if the mapped module has docstring."""
+        self.assertIsNotNone(mapped.__doc__, 'mapped lacks docstring')
+
+    def test_class_docstring(self):
+        """Test if the MappedSnapshot class has docstring."""
+        self.assertIsNotNone(MappedSnapshot.__doc__,
+                             'MappedSnapshot lacks docstring')
+
+    def test_method_docstrings(self):
+        """Test if all methods in MappedSnapshot class have docstrings."""
+        for name, method in inspect.getmembers(MappedSnapshot,
+                                               predicate=inspect.isfunction):
+            self.assertIsNotNone(
+                method.__doc__, '{} method lacks a docstring'.format(name))
+
+    def test_pep8_compliance_mapped(self):
+        """Test that mapped and test_mapped conform to PEP 8."""
+        style = pep8.StyleGuide(quiet=True)
+        result = style.check_files(
+            ['models/engine/mapped.py',
+             'tests/test_models/test_engine/test_mapped.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    """Test the MappedSnapshot class"""
+    def setUp(self):
+        """Create a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.map")
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def record(self, cls, id, **kwargs):
+        """Return a (key, record) pair"""
+        kwargs.update({"id": id, "__class__": cls})
+        return cls + "." + id, kwargs
+
+    def test_missing_file(self):
+        """Test that a missing file maps as an empty snapshot"""
+        snapshot = MappedSnapshot(self.path, get_codec("json")).open()
+        self.assertEqual(snapshot.index("State"), {})
+        self.assertIsNone(snapshot.get("State.1"))
+
+    def test_write_and_get(self):
+        """Test that records are read back one by one"""
+        snapshot = MappedSnapshot(self.path, get_codec("json")).open()
+        snapshot.write(dict([self.record("State", "1", name="California"),
+                             self.record("State", "2", name="Nevada"),
+                             self.record("City", "3", name="Reno")]))
+        snapshot = MappedSnapshot(self.path, get_codec("json")).open()
+        self.assertEqual(sorted(snapshot.index("State")),
+                         ["State.1", "State.2"])
+        self.assertEqual(snapshot.get("City.3")["name"], "Reno")
+        self.assertIsNone(snapshot.get("City.1"))
+
+    def test_write_changes(self):
+        """Test that a rewrite keeps, updates and deletes records"""
+        snapshot = MappedSnapshot(self.path, get_codec("json")).open()
+        snapshot.write(dict([self.record("State", "1", name="California"),
+                             self.record("State", "2", name="Nevada"),
+                             self.record("City", "3", name="Reno")]))
+        snapshot.write(dict([self.record("State", "2", name="Utah"),
+                             ("City.3", None),
+                             self.record("Amenity", "4", name="Wifi")]))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        self.assertEqual(snapshot.get("State.1")["name"], "California")
+        self.assertEqual(snapshot.get("State.2")["name"], "Utah")
+        self.assertIsNone(snapshot.get("City.3"))
+        self.assertEqual(snapshot.get("Amenity.4")["name"], "Wifi")
+
+    def test_invalid_file(self):
+        """Test that a file of another format is rejected"""
+        with open(self.path, "w") as f:
+            f.write("{}" * 20)
+        with self.assertRaises(ValueError):
+            MappedSnapshot(self.path, get_codec("json")).open()
@@ -85,6 +85,12 @@ class TestUser(unittest.TestCase):
         else:
             self.assertEqual(user.password, "")
 
+    def test_from_storage_keeps_password(self):
+        """Test that a stored password hash is not hashed again"""
+        user = User(email="a@b.c", password="pwd")
+        record = user.to_dict(include_password=True)
+        self.assertEqual(User.from_storage(record).password, user.password)
+
     def test_first_name_attr(self):
         """Test that User has attr first_name, and it's an empty string"""
         user = User()
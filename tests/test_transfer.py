@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""
+Contains the TestTransfer classes
+"""
+
+import contextlib
+import io
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import shutil
+import tempfile
+import transfer
+import unittest
+
+
+class TestTransferDocs(unittest.TestCase):
+    """Tests to check the documentation and style of transfer.py"""
+    def test_pep8_conformance_transfer(self):
+        """Test that transfer.py and test_transfer.py conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['transfer.py',
+                                    'tests/test_transfer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_transfer_module_docstring(self):
+        """Test for the transfer.py module docstring"""
+        self.assertIsNot(transfer.__doc__, None,
+                         "transfer.py needs a docstring")
+        self.assertTrue(len(transfer.__doc__) >= 1,
+                        "transfer.py needs a docstring")
+
+
+class TestTransfer(unittest.TestCase):
+    """Test exporting and importing the objects of the storage"""
+    def setUp(self):
+        """Create a few related objects and a scratch directory"""
+        self.dir = tempfile.mkdtemp()
+        self.state = State(name="California")
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.user = User(email="a@b.c", password="secret")
+        self.amenity = Amenity(name="Wifi")
+        self.place = Place(name="Loft", city_id=self.city.id,
+                           user_id=self.user.id, number_rooms=3,
+                           latitude=37.77)
+        self.objs = [self.user, self.state, self.city, self.amenity,
+                     self.place]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+        if models.storage_t == "db":
+            self.place.amenities.append(self.amenity)
+        else:
+            self.place.amenity_ids = [self.amenity.id]
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the objects and the scratch directory"""
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+        shutil.rmtree(self.dir)
+
+    def run_main(self, *argv):
+        """Run the command line with argv, hiding the progress report"""
+        with contextlib.redirect_stderr(io.StringIO()):
+            transfer.main(list(argv))
+
+    def delete_all(self):
+        """Delete the objects of the test from storage"""
+        for obj in reversed(self.objs):
+            models.storage.delete(models.storage.get(type(obj), obj.id))
+        models.storage.save()
+        models.storage.close()
+
+    def check_imported(self):
+        """Test that the objects of the test were imported back"""
+        for obj in self.objs:
+            self.assertIsNotNone(models.storage.get(type(obj), obj.id))
+        user = models.storage.get(User, self.user.id)
+        self.assertEqual(user.password, self.user.password)
+        place = models.storage.get(Place, self.place.id)
+        self.assertEqual(place.number_rooms, 3)
+        self.assertEqual(place.latitude, 37.77)
+        self.assertEqual([amenity.id for amenity in place.amenities],
+                         [self.amenity.id])
+
+    def test_ndjson_round_trip(self):
+        """Test exporting to NDJSON then importing into empty storage"""
+        path = os.path.join(self.dir, "dump.ndjson")
+        self.run_main("export", "-o", path, "-b", "2")
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        ids = [record["id"] for record in records]
+        for obj in self.objs:
+            self.assertIn(obj.id, ids)
+        self.assertLess(ids.index(self.user.id), ids.index(self.place.id))
+        self.delete_all()
+        self.run_main("import", "-i", path, "-b", "2")
+        self.check_imported()
+
+    def test_csv_round_trip(self):
+        """Test exporting to CSV then importing into empty storage"""
+        path = os.path.join(self.dir, "dump")
+        self.run_main("export", "-f", "csv", "-o", path)
+        self.assertTrue(os.path.isfile(os.path.join(path, "Place.csv")))
+        self.delete_all()
+        self.run_main("import", "-f", "csv", "-i", path)
+        self.check_imported()
+
+    def test_import_skips_existing(self):
+        """Test that importing objects already in storage is a no-op"""
+        path = os.path.join(self.dir, "dump.ndjson")
+        self.run_main("export", "-o", path, "-c", "State")
+        count = models.storage.count(State)
+        self.run_main("import", "-i", path)
+        self.assertEqual(models.storage.count(State), count)
+
+    def test_export_checkpoint(self):
+        """Test that an export resumes after its checkpoint"""
+        path = os.path.join(self.dir, "dump.ndjson")
+        checkpoint = os.path.join(self.dir, "checkpoint")
+        self.run_main("export", "-o", path, "-c", "State", "City",
+                      "--checkpoint", checkpoint)
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)["done"], ["State", "City"])
+        with open(path) as f:
+            lines = f.readlines()
+        self.run_main("export", "-o", path, "-c", "State", "City",
+                      "--checkpoint", checkpoint)
+        with open(path) as f:
+            self.assertEqual(f.readlines(), lines)
+
+    def test_import_checkpoint(self):
+        """Test that an import skips the records before its checkpoint"""
+        path = os.path.join(self.dir, "dump.ndjson")
+        checkpoint = os.path.join(self.dir, "checkpoint")
+        self.run_main("export", "-o", path, "-c", "State")
+        with open(path) as f:
+            total = len(f.readlines())
+        self.delete_all()
+        with open(checkpoint, "w") as f:
+            json.dump({"done": [], "class": "ndjson",
+                       "position": total}, f)
+        self.run_main("import", "-i", path, "--checkpoint", checkpoint)
+        self.assertIsNone(models.storage.get(State, self.state.id))
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)["done"], ["ndjson"])
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Contains the TestRenderCache classes
+"""
+import importlib
+import inspect
+import models
+import pep8
+import unittest
+from models.amenity import Amenity
+from models.state import State
+from web_flask import cache
+
+
+class TestRenderCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the render cache"""
+    def test_pep8_conformance_cache(self):
+        """Test that cache.py and test_cache.py conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_flask/cache.py',
+                                    'tests/test_web_flask/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test that the cache module and functions have docstrings"""
+        self.assertIsNotNone(cache.__doc__)
+        for name, func in inspect.getmembers(cache, inspect.isfunction):
+            if func.__module__ == cache.__name__:
+                self.assertIsNotNone(func.__doc__,
+                                     '{} lacks a docstring'.format(name))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestRenderCache(unittest.TestCase):
+    """Test the render cache of the hbnb_filters page"""
+    def setUp(self):
+        """Create a test client and an empty render cache"""
+        app = importlib.import_module("web_flask.10-hbnb_filters").app
+        self.client = app.test_client()
+        self.created = []
+        cache.rendered.clear()
+
+    def tearDown(self):
+        """Delete the objects created by the test"""
+        for obj in self.created:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def create(self, obj):
+        """Save obj and remember to delete it"""
+        obj.save()
+        self.created.append(obj)
+        return obj
+
+    def test_page_cached(self):
+        """Test that the page is served from memory until a change"""
+        self.create(State(name="California"))
+        page = self.client.get("/hbnb_filters").data
+        hits = cache.rendered.stats()["hits"]
+        self.assertEqual(self.client.get("/hbnb_filters").data, page)
+        self.assertEqual(cache.rendered.stats()["hits"], hits + 1)
+        self.create(State(name="Nevada"))
+        page = self.client.get("/hbnb_filters").data
+        self.assertIn(b"Nevada", page)
+
+    def test_fragments_cached(self):
+        """Test that unchanged fragments are reused by a new page"""
+        self.create(State(name="California"))
+        self.client.get("/hbnb_filters")
+        hits = cache.rendered.stats()["hits"]
+        self.create(Amenity(name="Wifi"))
+        page = self.client.get("/hbnb_filters").data
+        self.assertIn(b"Wifi", page)
+        self.assertIn(b"California", page)
+        self.assertEqual(cache.rendered.stats()["hits"], hits + 1)
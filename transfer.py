@@ -0,0 +1,333 @@
+#!/usr/bin/python3
+"""
+Streams the objects of the storage engine to and from NDJSON or CSV.
+
+The storage engine is the one selected by HBNB_TYPE_STORAGE, so moving a
+dataset from the file storage to the database is an export followed by
+an import under the other setting:
+
+    ./transfer.py export -o dump.ndjson
+    HBNB_TYPE_STORAGE=db ./transfer.py import -i dump.ndjson
+
+or, without an intermediate file:
+
+    ./transfer.py export | HBNB_TYPE_STORAGE=db ./transfer.py import
+
+NDJSON holds one to_dict() record per line. CSV is a directory holding
+one <class name>.csv file per class. Objects are read and written a
+batch at a time, so memory use does not depend on the size of the
+dataset. With --checkpoint, progress is recorded after every batch and
+an interrupted run started again with the same checkpoint resumes where
+it stopped. Throughput is reported on stderr.
+"""
+
+import argparse
+import csv
+from datetime import datetime
+import json
+import models
+from models.amenity import Amenity
+from models.base_model import BaseModel, time as time_format
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import sys
+import time
+
+# classes in an order where referenced objects come first
+classes = {"User": User, "State": State, "City": City, "Amenity": Amenity,
+           "Place": Place, "Review": Review}
+if models.storage_t != "db":
+    classes["BaseModel"] = BaseModel
+
+
+class Progress:
+    """reports the number of objects transferred and the throughput"""
+
+    def __init__(self, action, out=None):
+        """Instantiate a Progress printing to out, stderr by default"""
+        self.action = action
+        self.out = out
+        self.count = 0
+        self.start = time.monotonic()
+
+    def add(self, name, count):
+        """records count more objects of class name"""
+        self.count += count
+        elapsed = time.monotonic() - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0
+        print("{} {} {} objects ({} total, {:.0f}/s)".format(
+            self.action, count, name, self.count, rate),
+            file=self.out or sys.stderr)
+
+
+def load_checkpoint(path):
+    """returns the progress recorded at path, or an empty one"""
+    if path is None or not os.path.exists(path):
+        return {"done": [], "class": None, "position": None}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    """records checkpoint at path, replacing it atomically"""
+    if path is None:
+        return
+    with open(path + ".tmp", 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def record_of(obj):
+    """returns the record exported for obj"""
+    record = obj.to_dict(include_password=True)
+    if models.storage_t == "db" and isinstance(obj, Place):
+        record["amenity_ids"] = [amenity.id for amenity in obj.amenities]
+    return record
+
+
+def object_of(record, created):
+    """returns the object imported from record
+
+    created maps the ids of the objects of the current batch, not stored
+    yet, to the objects.
+    """
+    record = dict(record)
+    cls = classes[record["__class__"]]
+    amenity_ids = None
+    if models.storage_t == "db" and cls is Place:
+        amenity_ids = record.pop("amenity_ids", None)
+    obj = cls.from_storage(record)
+    if cls is User and "password" not in record:
+        # records saved by older file storages carry no password
+        obj.password = ""
+    if amenity_ids:
+        amenities = (created.get(amenity_id) or
+                     models.storage.get(Amenity, amenity_id)
+                     for amenity_id in amenity_ids)
+        obj.amenities = [amenity for amenity in amenities if amenity]
+    return obj
+
+
+def columns(cls):
+    """returns the {attribute: type} of the CSV columns of cls"""
+    types = {"id": str, "created_at": str, "updated_at": str}
+    if models.storage_t == "db":
+        for column in cls.__table__.columns:
+            if column.key not in types:
+                types[column.key] = column.type.python_type
+    else:
+        for name, value in sorted(vars(cls).items()):
+            if (not name.startswith("_") and not callable(value) and
+                    not isinstance(value, property)):
+                types[name] = type(value)
+    if cls is Place:
+        types["amenity_ids"] = list
+    return types
+
+
+def encode(value):
+    """returns the CSV cell holding value"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+def decode(row, cls):
+    """returns the record of class cls read from the CSV row"""
+    types = columns(cls)
+    record = {"__class__": cls.__name__}
+    for name, value in row.items():
+        if value == "" or name is None:
+            continue
+        kind = types.get(name, str)
+        if kind in (list, dict):
+            value = json.loads(value)
+        elif kind in (int, float, bool):
+            value = kind(float(value)) if kind is int else kind(value)
+        record[name] = value
+    return record
+
+
+def export_class(cls, write, batch_size, checkpoint, checkpoint_path,
+                 progress):
+    """writes every object of cls with write(), batch_size at a time"""
+    name = cls.__name__
+    cursor = None
+    if checkpoint["class"] == name and checkpoint["position"]:
+        created_at, obj_id = checkpoint["position"]
+        cursor = (datetime.strptime(created_at, time_format), obj_id)
+    while True:
+        objs = models.storage.page(cls, batch_size, cursor)
+        if not objs:
+            break
+        write([record_of(obj) for obj in objs])
+        cursor = (objs[-1].created_at, objs[-1].id)
+        checkpoint["class"] = name
+        checkpoint["position"] = [cursor[0].strftime(time_format), cursor[1]]
+        save_checkpoint(checkpoint_path, checkpoint)
+        progress.add(name, len(objs))
+        models.storage.close()
+    checkpoint["done"].append(name)
+    checkpoint["class"] = checkpoint["position"] = None
+    save_checkpoint(checkpoint_path, checkpoint)
+
+
+def export_ndjson(names, path, batch_size, checkpoint_path):
+    """exports the objects of the classes names to the NDJSON file path"""
+    checkpoint = load_checkpoint(checkpoint_path)
+    progress = Progress("exported")
+    if path == "-":
+        f = sys.stdout
+    else:
+        f = open(path, 'a' if checkpoint["done"] or checkpoint["class"]
+                 else 'w')
+
+    def write(records):
+        """writes one line per record"""
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+        f.flush()
+    try:
+        for name in names:
+            if name not in checkpoint["done"]:
+                export_class(classes[name], write, batch_size, checkpoint,
+                             checkpoint_path, progress)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def export_csv(names, path, batch_size, checkpoint_path):
+    """exports the objects of the classes names to CSV files in path"""
+    checkpoint = load_checkpoint(checkpoint_path)
+    progress = Progress("exported")
+    os.makedirs(path, exist_ok=True)
+    for name in names:
+        if name in checkpoint["done"]:
+            continue
+        cls = classes[name]
+        fields = list(columns(cls))
+        csv_path = os.path.join(path, name + ".csv")
+        resume = checkpoint["class"] == name
+        with open(csv_path, 'a' if resume else 'w', newline='') as f:
+            writer = csv.DictWriter(f, fields, extrasaction='ignore')
+            if not resume:
+                writer.writeheader()
+
+            def write(records):
+                """writes one row per record"""
+                writer.writerows({key: encode(value)
+                                  for key, value in record.items()}
+                                 for record in records)
+                f.flush()
+            export_class(cls, write, batch_size, checkpoint,
+                         checkpoint_path, progress)
+
+
+def import_records(records, name, batch_size, checkpoint, checkpoint_path,
+                   progress):
+    """stores the records read from an iterable, batch_size at a time,
+    skipping the checkpointed ones and the objects already in storage"""
+    position = 0
+    if checkpoint["class"] == name and checkpoint["position"]:
+        position = checkpoint["position"]
+    batch = []
+
+    def flush():
+        """stores batch and records the progress"""
+        created = {}
+        for record in batch:
+            if models.storage.get(record["__class__"], record["id"]) is None:
+                created[record["id"]] = object_of(record, created)
+        objs = list(created.values())
+        models.storage.bulk_new(objs)
+        models.storage.save()
+        checkpoint["class"] = name
+        checkpoint["position"] = position
+        save_checkpoint(checkpoint_path, checkpoint)
+        progress.add(name, len(objs))
+        models.storage.close()
+        del batch[:]
+    for index, record in enumerate(records):
+        if index < position:
+            continue
+        position = index + 1
+        if record.get("__class__") not in classes:
+            continue
+        batch.append(record)
+        if len(batch) == batch_size:
+            flush()
+    if batch:
+        flush()
+    checkpoint["done"].append(name)
+    checkpoint["class"] = checkpoint["position"] = None
+    save_checkpoint(checkpoint_path, checkpoint)
+
+
+def import_ndjson(path, batch_size, checkpoint_path):
+    """imports the objects of the NDJSON file path"""
+    checkpoint = load_checkpoint(checkpoint_path)
+    if "ndjson" in checkpoint["done"]:
+        return
+    progress = Progress("imported")
+    f = sys.stdin if path == "-" else open(path, 'r')
+    try:
+        records = (json.loads(line) for line in f if line.strip())
+        import_records(records, "ndjson", batch_size, checkpoint,
+                       checkpoint_path, progress)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def import_csv(path, batch_size, checkpoint_path):
+    """imports the objects of the CSV files in path"""
+    checkpoint = load_checkpoint(checkpoint_path)
+    progress = Progress("imported")
+    for name, cls in classes.items():
+        csv_path = os.path.join(path, name + ".csv")
+        if name in checkpoint["done"] or not os.path.exists(csv_path):
+            continue
+        with open(csv_path, 'r', newline='') as f:
+            records = (decode(row, cls) for row in csv.DictReader(f))
+            import_records(records, name, batch_size, checkpoint,
+                           checkpoint_path, progress)
+
+
+def main(argv=None):
+    """parses the command line and runs the export or import"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("-f", "--format", choices=["ndjson", "csv"],
+                        default="ndjson")
+    parser.add_argument("-o", "-i", "--path", default="-",
+                        help="NDJSON file (- for stdout/stdin) or CSV "
+                        "directory")
+    parser.add_argument("-c", "--classes", nargs="+", choices=list(classes),
+                        default=list(classes),
+                        help="classes to export (default: all)")
+    parser.add_argument("-b", "--batch", type=int, default=1000,
+                        help="objects per batch (default: 1000)")
+    parser.add_argument("--checkpoint",
+                        help="file recording the progress, to resume from")
+    args = parser.parse_args(argv)
+    if args.format == "csv" and args.path == "-":
+        parser.error("CSV needs a directory path")
+    names = [name for name in classes if name in args.classes]
+    if args.action == "export" and args.format == "ndjson":
+        export_ndjson(names, args.path, args.batch, args.checkpoint)
+    elif args.action == "export":
+        export_csv(names, args.path, args.batch, args.checkpoint)
+    elif args.format == "ndjson":
+        import_ndjson(args.path, args.batch, args.checkpoint)
+    else:
+        import_csv(args.path, args.batch, args.checkpoint)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,13 +6,16 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.cache import cached_page, fragment
 app = Flask(__name__)
+app.add_template_global(fragment)
 
 
 @app.route('/hbnb_filters', strict_slashes=False)
+@cached_page("State", "City", "Amenity")
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
+    states = storage.all("State", load=["cities"]).values()
     amenities = storage.all("Amenity").values()
     return render_template('10-hbnb_filters.html', states=states,
                            amenities=amenities)
@@ -6,10 +6,12 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.cache import cached_page
 app = Flask(__name__)
 
 
 @app.route('/states_list', strict_slashes=False)
+@cached_page("State")
 def states_list():
     """display a HTML page with the states listed in alphabetical order"""
     states = sorted(list(storage.all("State").values()), key=lambda x: x.name)
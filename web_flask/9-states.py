@@ -6,11 +6,13 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.cache import cached_page
 app = Flask(__name__)
 
 
 @app.route('/states', strict_slashes=False)
 @app.route('/states/<state_id>', strict_slashes=False)
+@cached_page("State", "City")
 def states(state_id=None):
     """display the states and cities listed in alphabetical order"""
     states = storage.all("State")
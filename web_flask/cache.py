@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Render cache of the web_flask pages listing states, cities and amenities.
+
+A page, or a fragment of one, is rendered once for each storage generation
+of the classes it shows and then served from memory until one of those
+generations changes. With a storage engine that has no generations, such
+as the database storage, everything is rendered on every request.
+"""
+
+from functools import wraps
+from flask import request
+from markupsafe import Markup
+from models import storage
+from models.engine.cache import ObjectCache
+
+# rendered pages and fragments, least recently used evicted first
+rendered = ObjectCache(256, ttl=3600, max_bytes=16 << 20)
+
+
+def cached(key, clss, render):
+    """returns render(), cached under key for the current generations of
+    the classes clss"""
+    generations = tuple(storage.generation(cls) for cls in clss)
+    if None in generations:
+        return render()
+    key = tuple(key) + generations
+    html = rendered.get(key)
+    if html is None:
+        html = render()
+        rendered.put(key, html)
+    return html
+
+
+def cached_page(*clss):
+    """decorates a view rendering the objects of the classes clss, so that
+    it only runs when one of them changed since its url was rendered"""
+    def decorator(view):
+        """returns view served from the render cache"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """returns the page of view at the requested url"""
+            return cached(("page", request.path), clss,
+                          lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def fragment(name, *args, classes=(), caller=None):
+    """template global caching the body of a {% call %} block under name
+    and args for the current generations of classes"""
+    return Markup(cached(("fragment", name) + args, classes, caller))